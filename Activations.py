@@ -0,0 +1,223 @@
+import math
+
+import numpy as np
+
+# sigmoid_table interpolates between this many samples of sigmoid, evenly spaced between -table_limit and table_limit
+table_limit = 16
+table_size = 4097
+table_step = 2 * table_limit / (table_size - 1)
+
+# sigmoid_clamp clamps its input between -clamp_limit and clamp_limit, past which sigmoid is within 2.4e-16 of 0 or 1
+clamp_limit = 36
+
+
+def sigmoid(t):
+    """
+    The sigmoid transfer function
+              1
+    S(t) = -------
+            1+e^-t
+
+    Args:
+        t: An int for the t in S(t)
+
+    Returns:
+        A float representing the output from the sigmoid function with t as the input.
+        If math.e ** -t causes an overflow error, then the output is rounded to 0.
+    """
+    try:
+        return 1 / (1 + math.e ** -t)
+    except OverflowError:
+        return 0
+
+
+def sigmoid_array(t, out=None):
+    """
+    The sigmoid transfer function applied to every element of an array. Like sigmoid, elements where e^-t overflows
+    are rounded to 0
+
+    Args:
+        t: An array for the t in S(t)
+        out: An array of the same shape to write the outputs to, which may be t, or None for a new array
+
+    Returns:
+        An array of the outputs from the sigmoid function for each element of t
+    """
+    out = np.negative(np.asarray(t, dtype=float), out=out)
+
+    with np.errstate(over="ignore"):
+        np.exp(out, out=out)
+
+    out += 1
+
+    return np.reciprocal(out, out=out)
+
+
+# The samples sigmoid_table interpolates between and the slope from each sample to the next, as arrays and as lists for
+# indexing one at a time. The last slope is 0 so the last sample can be indexed like the others
+table_outputs = sigmoid_array(np.linspace(-table_limit, table_limit, table_size))
+table_slopes = np.append(np.diff(table_outputs), 0)
+table_outputs_list = table_outputs.tolist()
+table_slopes_list = table_slopes.tolist()
+
+# The most sigmoid_table can differ from sigmoid. Linear interpolation is off by at most the largest curvature of
+# sigmoid, 1 / (6 * sqrt(3)), times the squared step over 8, and past the table's ends it is off by at most S(-limit)
+table_error_bound = max(table_step ** 2 / (48 * math.sqrt(3)), sigmoid(-table_limit)) + 1e-15
+
+
+def sigmoid_table(t):
+    """
+    The sigmoid transfer function interpolated from a table of samples, which never overflows and is within
+    table_error_bound of sigmoid
+
+    Args:
+        t: A float for the t in S(t)
+
+    Returns:
+        A float for the interpolated output
+    """
+    if t <= -table_limit:
+        return table_outputs_list[0]
+    elif t >= table_limit:
+        return table_outputs_list[-1]
+
+    position = (t + table_limit) / table_step
+    index = int(position)
+
+    return table_outputs_list[index] + (position - index) * table_slopes_list[index]
+
+
+def sigmoid_table_array(t, out=None):
+    """
+    sigmoid_table applied to every element of an array
+
+    Args:
+        t: An array for the t in S(t)
+        out: An array of the same shape to write the outputs to, which may be t, or None for a new array
+
+    Returns:
+        An array of the interpolated output for each element of t
+    """
+    # The position of each element in the table, where the table's ends stand in for everything past them
+    position = np.clip(np.asarray(t, dtype=float), -table_limit, table_limit)
+    position += table_limit
+    position /= table_step
+    index = position.astype(int)
+    position -= index
+
+    out = np.multiply(position, table_slopes[index], out=out)
+    out += table_outputs[index]
+
+    return out
+
+
+def sigmoid_clamp(t):
+    """
+    The sigmoid transfer function with its input clamped so e^-t never overflows, instead of catching the overflow.
+    It is the same as sigmoid between -clamp_limit and clamp_limit and within 2.4e-16 of it everywhere
+
+    Args:
+        t: A float for the t in S(t)
+
+    Returns:
+        A float for the output
+    """
+    if t < -clamp_limit:
+        t = -clamp_limit
+    elif t > clamp_limit:
+        t = clamp_limit
+
+    return 1 / (1 + math.e ** -t)
+
+
+def sigmoid_clamp_array(t, out=None):
+    """
+    sigmoid_clamp applied to every element of an array
+
+    Args:
+        t: An array for the t in S(t)
+        out: An array of the same shape to write the outputs to, which may be t, or None for a new array
+
+    Returns:
+        An array of the output for each element of t
+    """
+    clamped = np.clip(np.asarray(t, dtype=float), -clamp_limit, clamp_limit, out=out)
+
+    return sigmoid_array(clamped, out=clamped)
+
+
+def tanh_array(t, out=None):
+    """
+    The hyperbolic tangent applied to every element of an array
+
+    Args:
+        t: An array of the inputs
+        out: An array of the same shape to write the outputs to, which may be t, or None for a new array
+
+    Returns:
+        An array of the output between -1 and 1 for each element of t
+    """
+    return np.tanh(t, out=out)
+
+
+def relu(t):
+    """
+    The rectified linear unit, which passes positive inputs and outputs 0 for the rest
+
+    Args:
+        t: A float for the input
+
+    Returns:
+        A float for the output
+    """
+    return t if t > 0 else 0.
+
+
+def relu_array(t, out=None):
+    """
+    relu applied to every element of an array
+
+    Args:
+        t: An array of the inputs
+        out: An array of the same shape to write the outputs to, which may be t, or None for a new array
+
+    Returns:
+        An array of the output for each element of t
+    """
+    return np.maximum(t, 0, out=out)
+
+
+# The function applied to one neuron's weighted sum and the function applied to an array of them, by name
+activations = {
+    "sigmoid": (sigmoid, sigmoid_array),
+    "sigmoid_table": (sigmoid_table, sigmoid_table_array),
+    "sigmoid_clamp": (sigmoid_clamp, sigmoid_clamp_array),
+    "tanh": (math.tanh, tanh_array),
+    "relu": (relu, relu_array),
+}
+
+# The activations whose outputs are between 0 and 1, which a Creature's outputs must be
+bounded = ("sigmoid", "sigmoid_table", "sigmoid_clamp")
+
+
+def get_activation(name, output=False):
+    """
+    Get an activation by name
+
+    Args:
+        name: A string in activations
+        output: A boolean for whether the activation is for an output layer, which must be bounded
+
+    Returns:
+        A tuple of the function applied to one neuron and the function applied to an array of neurons
+
+    Raises:
+        ValueError: The name is not in activations, or output is True and the name is not in bounded
+    """
+    if name not in activations:
+        raise ValueError("Unknown activation %s" % name)
+
+    if output and name not in bounded:
+        raise ValueError("The output activation must be one of %s, not %s" % (", ".join(bounded), name))
+
+    return activations[name]
@@ -0,0 +1,395 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import Activations
+import Config
+import Creature
+import Genome
+import NeuralNetwork
+import Profiler
+import Snapshot
+import World
+
+# The version of the format of baseline files, increased whenever a baseline written before a change could not be
+# compared against
+baseline_version = 1
+
+# The phases of a tick, in order. render is not part of World.step but what drawing a frame after every tick would
+# cost outside Tk: taking a Snapshot of the tiles in view and building the board image when one changed
+phases = ("sense", "think", "act", "move", "die", "board", "render")
+
+
+def time_calls(function, num_calls):
+    """
+    Time calling a function repeatedly
+
+    Args:
+        function: A function taking no arguments
+        num_calls: An integer count of the calls
+
+    Returns:
+        A float for the mean seconds per call
+    """
+    start = time.perf_counter()
+    for i in range(num_calls):
+        function()
+
+    return (time.perf_counter() - start) / num_calls
+
+
+def benchmark_networks(num_networks=100, num_calls=200, seed=0):
+    """
+    Compare interpreting random Creature networks with NeuralNetwork to compiling them into PackedNetworks
+
+    Args:
+        num_networks: An integer count of the random Genomes to build networks from
+        num_calls: An integer count of the times each network is calculated
+        seed: An integer to seed the Genomes and inputs with
+
+    Returns:
+        A dictionary mapping "interpreted" and "compiled" to a tuple of the mean microseconds to build a network, the
+        mean microseconds to calculate one and the largest difference of an output from the interpreted output
+    """
+    generator = np.random.default_rng(seed)
+    genomes = [Genome.random_genome(Creature.genome_sizes, generator) for i in range(num_networks)]
+    inputs = [(generator.random(Creature.num_inputs) * 255).tolist() for i in range(num_networks)]
+
+    results = {}
+    expected = [NeuralNetwork.from_genome(genome).calculate_network(list(x)) for genome, x in zip(genomes, inputs)]
+
+    for name, build in (("interpreted", NeuralNetwork.from_genome), ("compiled", NeuralNetwork.PackedNetwork)):
+        build_time = 0
+        call_time = 0
+        difference = 0
+
+        for genome, x, outputs in zip(genomes, inputs, expected):
+            build_time += time_calls(lambda: build(genome), 10)
+
+            network = build(genome)
+            call_time += time_calls(lambda: network.calculate_network(x), num_calls)
+            difference = max(difference, np.abs(np.subtract(network.calculate_network(x), outputs)).max())
+
+        results[name] = (build_time / num_networks * 1e6, call_time / num_networks * 1e6, difference)
+
+    return results
+
+
+def benchmark_activations(num_values=100000, seed=0):
+    """
+    Measure the speed of every activation, and the accuracy of the approximations of sigmoid against sigmoid. Speed is
+    measured on weighted sums typical of a Creature's neurons and on saturated ones, where sigmoid overflows
+
+    Args:
+        num_values: An integer count of the weighted sums to apply each activation to
+        seed: An integer to seed the weighted sums with
+
+    Returns:
+        A dictionary mapping the name of each activation to a tuple of the nanoseconds per typical call and per
+        saturated call of its function on one neuron, the nanoseconds per element of its function on arrays, and the
+        largest difference from sigmoid over both, or None if it does not approximate sigmoid
+    """
+    generator = np.random.default_rng(seed)
+    typical = generator.uniform(-10, 10, num_values)
+    saturated = generator.uniform(-1000, 1000, num_values)
+    exact = Activations.sigmoid_array(np.concatenate((typical, saturated)))
+
+    results = {}
+    for name, (function, array_function) in Activations.activations.items():
+        times = []
+        for values in (typical.tolist(), saturated.tolist()):
+            start = time.perf_counter()
+            for value in values:
+                function(value)
+
+            times.append((time.perf_counter() - start) / num_values * 1e9)
+
+        times.append(time_calls(lambda: array_function(typical), 10) / num_values * 1e9)
+
+        difference = None
+        if name in Activations.bounded:
+            outputs = [function(value) for value in np.concatenate((typical, saturated)).tolist()]
+            array_outputs = array_function(np.concatenate((typical, saturated)))
+            difference = max(np.abs(np.subtract(outputs, exact)).max(), np.abs(array_outputs - exact).max())
+
+        results[name] = tuple(times) + (difference,)
+
+    return results
+
+
+def benchmark_worlds(ticks=200, init_creature_num=100, seed=0):
+    """
+    Compare stepping a World updated one Creature at a time with interpreted and compiled networks. The two Worlds
+    drift apart by rounding, so their speed is compared per Creature updated
+
+    Args:
+        ticks: An integer count of the ticks to simulate
+        init_creature_num: An integer count of the creatures each World starts with
+        seed: An integer to seed the Worlds with
+
+    Returns:
+        A dictionary mapping "interpreted" and "compiled" to a tuple of the mean microseconds per Creature updated and
+        the count of creatures updated
+    """
+    results = {}
+
+    for name, compiled in (("interpreted", False), ("compiled", True)):
+        world = World.World(Config.WorldConfig(seed=seed, init_creature_num=init_creature_num), batched=False,
+                            compiled=compiled)
+        updates = 0
+        elapsed = 0
+
+        for i in range(ticks):
+            updates += world.population.size
+
+            start = time.perf_counter()
+            world.step()
+            elapsed += time.perf_counter() - start
+
+        results[name] = (elapsed / max(1, updates) * 1e6, updates)
+
+    return results
+
+
+def benchmark_ticks(case):
+    """
+    Simulate a headless World and measure how fast it ticks, where the time goes and how much memory it uses. Runs in
+    its own process so the peak memory is of this World alone
+
+    Args:
+        case: A tuple of the integer init_creature_num, the integer tiles_per_row, the integer count of ticks to
+            measure, the integer count of ticks to simulate first without measuring and the integer seed
+
+    Returns:
+        A dictionary of the settings of the case, the ticks per second not counting render, the mean milliseconds
+        per tick spent in each phase, the creatures alive at the end, the peak resident memory of the process in
+        megabytes and the mean kilobytes allocated at once within a tick, measured separately from the speed as
+        tracing slows every allocation
+    """
+    init_creature_num, tiles_per_row, ticks, warmup, seed = case
+
+    profiler = Profiler.Profiler()
+    world = World.World(Config.WorldConfig(seed=seed, init_creature_num=init_creature_num,
+                                           tiles_per_row=tiles_per_row), profiler=profiler)
+
+    # The tile under each pixel of the board image when the whole board is shown, as CanvasRenderer first shows it
+    config = world.config
+    width = min(config.board_width, config.app_width)
+    height = min(config.board_height, config.app_height)
+    scale = min(width / config.board_width, height / config.board_height)
+    outline = scale * config.tile_width >= 4
+    pixel_rows = Snapshot.get_pixel_tiles(height, 0, scale, config.tile_width, config.tiles_per_row, outline)
+    pixel_columns = Snapshot.get_pixel_tiles(width, 0, scale, config.tile_width, config.tiles_per_row, outline)
+    visible_rows = np.unique(pixel_rows[pixel_rows >= 0])
+    visible_columns = np.unique(pixel_columns[pixel_columns >= 0])
+    tiles = np.zeros((config.tiles_per_row, config.tiles_per_row, 3), dtype=np.uint8)
+
+    snapshot = Snapshot.take_snapshot(world, None, visible_rows, visible_columns)
+    world.step(warmup)
+
+    profiler.totals = {}
+    elapsed = 0
+    for i in range(ticks):
+        start = time.perf_counter()
+        world.step()
+        elapsed += time.perf_counter() - start
+
+        profiler.begin()
+        snapshot = Snapshot.take_snapshot(world, snapshot, visible_rows, visible_columns)
+        if snapshot.board_tick == world.tick:
+            tiles[np.ix_(snapshot.tile_rows, snapshot.tile_columns)] = snapshot.rgb
+            Snapshot.get_ppm(tiles, pixel_rows, pixel_columns)
+
+        profiler.mark("render")
+
+    # The most memory held at once during each tick beyond what was held before it
+    world.profiler = None
+    allocated = 0
+    tracemalloc.start()
+    for i in range(ticks):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        world.step()
+        allocated += tracemalloc.get_traced_memory()[1] - current
+
+    tracemalloc.stop()
+
+    # ru_maxrss is in kilobytes, except on macOS where it is in bytes
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform == "darwin" else 1) / 1024
+
+    return {"init_creature_num": init_creature_num, "tiles_per_row": tiles_per_row, "ticks": ticks, "seed": seed,
+            "ticks_per_second": ticks / elapsed,
+            "phases": dict((phase, profiler.totals.get(phase, 0) / ticks * 1e3) for phase in phases),
+            "creatures": world.population.size, "peak_rss": peak_rss, "allocated": allocated / ticks / 1024}
+
+
+def run_tick_benchmarks(creature_nums, tiles_per_rows, ticks=100, warmup=10, seed=0):
+    """
+    Run benchmark_ticks for every combination of creature and tile counts, one case at a time so they never compete
+    for the processor, each in a new process. The result of each case is given as soon as it finishes
+
+    Args:
+        creature_nums: A list of the integer init_creature_num of each case
+        tiles_per_rows: A list of the integer tiles_per_row of each case
+        ticks: An integer count of the ticks to measure in each case
+        warmup: An integer count of the ticks to simulate in each case before measuring
+        seed: An integer to seed every World with
+
+    Yields:
+        The result of each case from benchmark_ticks, in order
+    """
+    cases = [(creature_num, tiles_per_row, ticks, warmup, seed)
+             for creature_num in creature_nums for tiles_per_row in tiles_per_rows]
+
+    pool = multiprocessing.Pool(1, maxtasksperchild=1)
+    for result in pool.imap(benchmark_ticks, cases):
+        yield result
+
+    pool.close()
+    pool.join()
+
+
+def write_baseline(results, path):
+    """
+    Write the results of run_tick_benchmarks to a JSON file for later runs to be compared against
+
+    Args:
+        results: A list of results of run_tick_benchmarks
+        path: A string for the path of the file to write
+    """
+    baseline = {"version": baseline_version, "python": platform.python_version(), "numpy": np.__version__,
+                "machine": platform.machine(), "processor": platform.processor(), "results": results}
+
+    with open(path, "w") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+
+
+def read_baseline(path):
+    """
+    Read the results of a baseline written by write_baseline
+
+    Args:
+        path: A string for the path of the file
+
+    Returns:
+        A list of results of run_tick_benchmarks
+
+    Raises:
+        ValueError: The file was written by an incompatible version
+    """
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    if baseline["version"] != baseline_version:
+        raise ValueError("Cannot compare against a version %s baseline, only version %d" %
+                         (baseline["version"], baseline_version))
+
+    return baseline["results"]
+
+
+def find_regressions(results, baseline, threshold=.1):
+    """
+    Compare results with the baseline results of the same cases
+
+    Args:
+        results: A list of results of run_tick_benchmarks
+        baseline: A list of results from read_baseline
+        threshold: A float for the fraction the ticks per second can fall or the peak memory can rise by before it is
+            a regression
+
+    Returns:
+        A list of a tuple of the result, the baseline result, the fraction the ticks per second changed by, the
+        fraction the peak memory changed by and whether either is a regression, for each result with a baseline
+    """
+    keys = ("init_creature_num", "tiles_per_row", "ticks", "seed")
+    baseline_results = dict((tuple(result[key] for key in keys), result) for result in baseline)
+
+    comparisons = []
+    for result in results:
+        previous = baseline_results.get(tuple(result[key] for key in keys))
+        if previous is None:
+            continue
+
+        speed_change = result["ticks_per_second"] / previous["ticks_per_second"] - 1
+        memory_change = result["peak_rss"] / previous["peak_rss"] - 1
+        comparisons.append((result, previous, speed_change, memory_change,
+                            speed_change < -threshold or memory_change > threshold))
+
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evolution Simulator benchmarks")
+    parser.add_argument("benchmark", choices=("networks", "activations", "worlds", "ticks"), help="what to benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random Genomes, inputs and Worlds")
+    parser.add_argument("--creatures", type=int, nargs="+", default=[100, 1000, 5000, 20000],
+                        help="init_creature_num of each World the ticks benchmark runs")
+    parser.add_argument("--tiles", type=int, nargs="+", default=[100, 300, 1000],
+                        help="tiles_per_row of each World the ticks benchmark runs")
+    parser.add_argument("--ticks", type=int, default=100, help="ticks the ticks benchmark measures in each World")
+    parser.add_argument("--warmup", type=int, default=10, help="ticks simulated in each World before measuring")
+    parser.add_argument("--save-baseline", metavar="PATH", help="JSON file to write the ticks benchmark's results to")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON file to compare the ticks benchmark against")
+    parser.add_argument("--threshold", type=float, default=.1,
+                        help="fraction the ticks per second can fall or the peak memory can rise by before it is a "
+                             "regression")
+    args = parser.parse_args()
+
+    if args.benchmark == "networks":
+        results = benchmark_networks(seed=args.seed)
+        for name, (build_time, call_time, difference) in results.items():
+            print("%-12s %8.2f us to build %8.2f us per call, outputs within %.1e of interpreted" %
+                  (name, build_time, call_time, difference))
+
+        print("Compiled networks are %.1fx faster per call" % (results["interpreted"][1] / results["compiled"][1]))
+    elif args.benchmark == "activations":
+        print("%-14s %12s %14s %12s %12s" % ("", "ns per call", "ns saturated", "ns per item", "max error"))
+        for name, (call_time, saturated_time, item_time, difference) in benchmark_activations(seed=args.seed).items():
+            print("%-14s %12.1f %14.1f %12.2f %12s" % (name, call_time, saturated_time, item_time,
+                                                       "-" if difference is None else "%.1e" % difference))
+
+        print("sigmoid_table is guaranteed to be within %.1e of sigmoid" % Activations.table_error_bound)
+    elif args.benchmark == "worlds":
+        results = benchmark_worlds(seed=args.seed)
+        for name, (update_time, updates) in results.items():
+            print("%-12s %8.2f us per Creature updated over %d updates" % (name, update_time, updates))
+
+        print("Compiled worlds are %.1fx faster per Creature" % (results["interpreted"][0] / results["compiled"][0]))
+    elif args.benchmark == "ticks":
+        header = ("creatures", "tiles", "ticks/s", " ".join("%7s" % phase for phase in phases), "alive", "peak MB",
+                  "KB/tick")
+        print("%9s %6s %9s %s %9s %9s %9s" % header)
+
+        results = []
+        for result in run_tick_benchmarks(args.creatures, args.tiles, args.ticks, args.warmup, args.seed):
+            results.append(result)
+            print("%9d %6d %9.1f %s %9d %9.1f %9.1f" %
+                  (result["init_creature_num"], result["tiles_per_row"], result["ticks_per_second"],
+                   " ".join("%7.2f" % result["phases"][phase] for phase in phases), result["creatures"],
+                   result["peak_rss"], result["allocated"]))
+
+        print("Phases are in milliseconds per tick")
+
+        if args.save_baseline is not None:
+            write_baseline(results, args.save_baseline)
+
+        if args.compare is not None:
+            comparisons = find_regressions(results, read_baseline(args.compare), args.threshold)
+            for result, previous, speed_change, memory_change, regressed in comparisons:
+                print("%9d %6d %+8.1f%% ticks/s %+8.1f%% peak memory%s" %
+                      (result["init_creature_num"], result["tiles_per_row"], speed_change * 100, memory_change * 100,
+                       "  REGRESSION" if regressed else ""))
+
+            if any(comparison[4] for comparison in comparisons):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,258 @@
-import Utils
+import numpy as np
+
+import Terrain
+
+
+class Board(object):
+    """
+    The tiles of the world stored as one 2D array per attribute, indexed by [row, column]. A tile's index is
+    column + row * config.tiles_per_row
+
+    Food and water regrow by regrowth_rate every tick up to 255. When lazy, the arrays only hold each tile's food and
+    water as of the tick in last_tick, and a tile is brought up to date in closed form by sync when it is read or
+    changed, so the cost of regrowth depends on how many tiles creatures interact with instead of the area of the board
+
+    Attributes:
+        config: The WorldConfig of the World the Board belongs to
+        temp: A 2D array of the temperature and red value of each tile
+        food: A 2D array of the amount of food and green value of each tile
+        water: A 2D array of the amount of water and blue value of each tile
+        regrowth_rate: An integer amount of food and water each tile regrows per tick
+        lazy: A boolean for whether regrowth is only calculated when a tile is synced
+        tick: An integer count of the ticks the Board has advanced
+        last_tick: A 2D array of the tick each tile's food and water were last brought up to date when lazy
+    """
+
+    def __init__(self, config, temp, food, water):
+        """
+        Initializes the Board, taking its regrowth_rate and lazy from the config's regrowth_rate and lazy_regrowth
+
+        Args:
+            config: The WorldConfig of the World the Board belongs to
+            temp: A 2D array of the temperature of each tile, clamped between 0 and 255
+            food: A 2D array of the amount of food of each tile, clamped between 0 and 255
+            water: A 2D array of the amount of water of each tile, clamped between 0 and 255
+        """
+        self.config = config
+        self.temp = np.clip(temp, 0, 255).astype(int)
+        self.food = np.clip(food, 0, 255).astype(int)
+        self.water = np.clip(water, 0, 255).astype(int)
+        self.regrowth_rate = config.regrowth_rate
+        self.lazy = config.lazy_regrowth
+        self.tick = 0
+        self.last_tick = np.zeros(self.temp.shape, dtype=int)
+
+    def get_state(self):
+        """
+        Get everything needed to restore the Board
+
+        Returns:
+            A dictionary mapping the name of each attribute that changes as the Board advances to its value
+        """
+        return {"temp": self.temp, "food": self.food, "water": self.water, "tick": self.tick,
+                "last_tick": self.last_tick}
+
+    def set_state(self, state):
+        """
+        Restore the Board to a state from get_state, copying the arrays
+
+        Args:
+            state: A dictionary from get_state
+        """
+        for name in ("temp", "food", "water", "last_tick"):
+            setattr(self, name, np.array(state[name], dtype=int))
+
+        self.tick = int(state["tick"])
+
+    def get_tile(self, index):
+        """
+        Get an up to date Tile for a tile index
+
+        Args:
+            index: An integer for the index of the tile
+
+        Returns:
+            A Tile reading and writing the tile's values in the Board
+        """
+        self.sync(index)
+
+        return Tile(self, index)
+
+    def advance(self):
+        """
+        Advance the Board by one tick, regrowing every tile unless regrowth is lazy
+        """
+        self.tick += 1
+
+        if not self.lazy and self.regrowth_rate > 0:
+            self.regrow(self.regrowth_rate)
+
+    def sync(self, indices=None):
+        """
+        Bring tiles up to date with the regrowth since they were last synced. Does nothing unless regrowth is lazy
+
+        Args:
+            indices: An integer or array of the indices of the tiles to sync, or None for every tile
+        """
+        if not self.lazy:
+            return
+
+        if indices is None:
+            indices = slice(None)
+
+        last_tick = self.last_tick.reshape(-1)
+        growth = self.regrowth_rate * (self.tick - last_tick[indices])
+        last_tick[indices] = self.tick
+
+        for field in (self.food, self.water):
+            flat = field.reshape(-1)
+            flat[indices] = np.minimum(flat[indices] + growth, 255)
+
+    def get_rgb(self, rows=None, columns=None):
+        """
+        Get the colour of every tile in a block of rows and columns at once. When lazy, the food and water are
+        worked out as of the current tick without syncing the tiles, so reading colours never changes the Board and
+        only costs as much as the size of the block
+
+        Args:
+            rows: An array of the rows of the block, or None for every row
+            columns: An array of the columns of the block, or None for every column
+
+        Returns:
+            A 3D array of bytes indexed by [row, column, channel] of the block holding the red, green and blue value
+            of each tile
+        """
+        if rows is None:
+            rows = np.arange(self.temp.shape[0])
+        if columns is None:
+            columns = np.arange(self.temp.shape[1])
+
+        # Taking the rows then the columns copies the block, so it can be worked on in place
+        temp, food, water, last_tick = (values.take(rows, 0).take(columns, 1)
+                                        for values in (self.temp, self.food, self.water, self.last_tick))
+
+        if self.lazy:
+            growth = self.tick - last_tick
+            growth *= self.regrowth_rate
+            for field in (food, water):
+                field += growth
+                np.minimum(field, 255, out=field)
+
+        rgb = np.empty(temp.shape + (3,), dtype=np.uint8)
+        rgb[:, :, 0] = temp
+        rgb[:, :, 1] = food
+        rgb[:, :, 2] = water
+
+        return rgb
+
+    def regrow(self, amount):
+        """
+        Regrow the food and water of every tile, up to 255
+
+        Args:
+            amount: An integer amount of food and water each tile regrows
+        """
+        for field in (self.food, self.water):
+            np.minimum(field + amount, 255, out=field)
+
+    def consume(self, field, tiles, amount):
+        """
+        Take up to an amount from tiles for each of several creatures at once. When several creatures take from the
+        same tile, they take in the order given until the tile runs out
+
+        Args:
+            field: The 2D array to take from, such as food or water
+            tiles: An array of the index of the tile each Creature takes from
+            amount: An integer for the most each Creature can take
+
+        Returns:
+            An array of how much each Creature took, in the order given
+        """
+        self.sync(tiles)
+
+        order = np.argsort(tiles, kind="stable")
+        sorted_tiles = tiles[order]
+        unique, starts, counts = np.unique(sorted_tiles, return_index=True, return_counts=True)
+
+        # How many creatures are before each Creature on the same tile
+        position = np.arange(len(sorted_tiles)) - np.repeat(starts, counts)
+
+        flat = field.reshape(-1)
+        taken = np.empty(len(tiles), dtype=field.dtype)
+        taken[order] = np.clip(flat[sorted_tiles] - amount * position, 0, amount)
+
+        flat[unique] -= np.minimum(flat[unique], amount * counts)
+
+        return taken
 
 
 class Tile(object):
-    def __init__(self, x, y, r, g, b, canvas):
-        self.x0 = x
-        self.y0 = y
-        self.x1 = x + Utils.tile_width
-        self.y1 = y + Utils.tile_width
+    """
+    A handle to one tile of a Board
 
-        # Default temperature and red value
-        self.temp = clamp_rgb(r)
+    Attributes:
+        board: The Board containing the tile
+        index: An integer for the index of the tile
+        row: An integer for the row of the tile
+        column: An integer for the column of the tile
+        x0: A float for the left edge of the tile
+        y0: A float for the top edge of the tile
+        x1: A float for the right edge of the tile
+        y1: A float for the bottom edge of the tile
+        temp: An integer for the default temperature and red value
+        food: An integer for the amount of food and green value as of when the Tile was got
+        water: An integer for the amount of water and blue value as of when the Tile was got
+    """
 
-        # Amount of food and green value
-        self.food = clamp_rgb(g)
+    def __init__(self, board, index):
+        self.board = board
+        self.index = index
+        self.row, self.column = divmod(index, board.temp.shape[1])
 
-        # Amount of water and blue value
-        self.water = clamp_rgb(b)
+        tile_width = board.config.tile_width
+        self.x0 = self.column * tile_width
+        self.y0 = self.row * tile_width
+        self.x1 = self.x0 + tile_width
+        self.y1 = self.y0 + tile_width
 
-        self.canvas = canvas
+    @property
+    def temp(self):
+        return self.board.temp[self.row, self.column].item()
 
-        rgb_hex = Utils.rgb_to_hex(self.temp, self.food, self.water)
-        self.rectangle = self.canvas.create_rectangle(self.x0, self.y0, self.x1, self.y1, outline="black", fill=rgb_hex)
+    @property
+    def food(self):
+        return self.board.food[self.row, self.column].item()
+
+    @property
+    def water(self):
+        return self.board.water[self.row, self.column].item()
 
     def set_temp(self, temp):
-        self.temp = temp
-        self.add_to_update()
+        self.board.temp[self.row, self.column] = temp
 
     def set_food(self, food):
-        self.food = food
-        self.add_to_update()
+        self.board.food[self.row, self.column] = food
 
     def set_water(self, water):
-        self.water = water
-        self.add_to_update()
-
-    def add_to_update(self):
-        if self not in Utils.tile_update:
-            Utils.tile_update.append(self)
+        self.board.water[self.row, self.column] = water
 
-    def update(self):
-        # TODO: use calculus to only update when Creature interacts
-        if self.food < 255:
-            self.set_food(Utils.clamp(self.food + 1, 0, 255))
 
-        if self.water < 255:
-            self.set_water(Utils.clamp(self.water + 1, 0, 255))
+def create_board(config, generator):
+    """
+    Creates the world tiles from two layers of perlin noise, read from config.terrain_cache when it was created before.
+    Without a seed the noise is never the same twice, so it is not cached
 
-    def draw(self):
-        rgb_hex = Utils.rgb_to_hex(self.temp, self.food, self.water)
+    Args:
+        config: The WorldConfig of the World the Board belongs to
+        generator: A Generator to draw the position of each layer in the noise from
 
-        self.canvas.itemconfig(self.rectangle, fill=rgb_hex)
-        self.canvas.coords(self.rectangle, self.x0, self.y0, self.x1, self.y1)
+    Returns:
+        A new Board
+    """
+    r1 = generator.random()
+    r2 = generator.random()
 
+    cache = config.terrain_cache if config.seed is not None else None
+    food, water = Terrain.get_terrain(config.tiles_per_row, (r1, r2), config.terrain_octaves, cache)
 
-def clamp_rgb(x):
-    return max(0, min(x, 255))
+    return Board(config, np.zeros(food.shape), food, water)
@@ -0,0 +1,198 @@
+import json
+import os
+
+import numpy as np
+
+import Config
+import World
+
+# The version of the checkpoint format, increased whenever a checkpoint written before a change could not be loaded
+version = 1
+
+
+class Checkpointer(object):
+    """
+    Saves a World to a checkpoint file every interval ticks, so a long run survives a crash or a closed window and can
+    be resumed, headless or in the GUI
+
+    Attributes:
+        path: A string for the path of the checkpoint file
+        interval: An integer count of the ticks between saves
+        resume: A boolean for whether to continue from the checkpoint file if it exists instead of a new World
+        saved_tick: An integer for the tick the World was last saved on, or None before it is first saved
+    """
+
+    def __init__(self, path, interval=5000, resume=False):
+        """
+        Initializes the Checkpointer
+
+        Args:
+            path: A string for the path of the checkpoint file
+            interval: An integer count of the ticks between saves
+            resume: A boolean for whether to continue from the checkpoint file if it exists instead of a new World
+        """
+        self.path = path
+        self.interval = interval
+        self.resume = resume
+        self.saved_tick = None
+
+    def is_resuming(self):
+        """
+        Check if the World will be resumed from the checkpoint file
+
+        Returns:
+            A boolean for whether resume is set and the checkpoint file exists
+        """
+        return self.resume and os.path.exists(self.path)
+
+    def get_config(self, config=None):
+        """
+        Get the settings of the World that create_world will return
+
+        Args:
+            config: The WorldConfig of a new World, or None for the default settings
+
+        Returns:
+            The WorldConfig of the checkpoint when resuming, otherwise config
+        """
+        if self.is_resuming():
+            return read_config(self.path)
+
+        return Config.WorldConfig() if config is None else config
+
+    def create_world(self, config=None, batched=True, events=None):
+        """
+        Create the World to simulate, resumed from the checkpoint file when resuming
+
+        Args:
+            config: The WorldConfig of a new World, or None for the default settings. Ignored when resuming
+            batched: A boolean for whether the whole population is updated at once each tick
+            events: An EventLog to record what happens in the World, or None
+
+        Returns:
+            A World
+        """
+        if self.is_resuming():
+            world = load_checkpoint(self.path, batched=batched, events=events)
+        else:
+            world = World.World(config, batched=batched, events=events)
+
+        self.saved_tick = world.tick
+
+        return world
+
+    def update(self, world):
+        """
+        Save a World if at least interval ticks have passed since it was last saved
+
+        Args:
+            world: The World to save
+        """
+        if self.saved_tick is None or world.tick - self.saved_tick >= self.interval:
+            self.save(world)
+
+    def save(self, world):
+        """
+        Save a World now, unless it was already saved on its current tick
+
+        Args:
+            world: The World to save
+        """
+        if world.tick != self.saved_tick:
+            save_checkpoint(world, self.path)
+            self.saved_tick = world.tick
+
+
+def save_checkpoint(world, path):
+    """
+    Save everything needed to resume a World to an uncompressed .npz file, with one array per tile and Creature
+    attribute. The file is written next to path then moved over it, so a crash while saving keeps the last checkpoint
+
+    Args:
+        world: The World to save
+        path: A string for the path of the file to write
+    """
+    state = world.get_state()
+    arrays = {}
+
+    for section in ("board", "population"):
+        for name, value in state[section].items():
+            arrays["%s_%s" % (section, name)] = value
+
+    # The settings and the states of the random streams hold integers too large for an array, so they are JSON
+    metadata = {"version": version, "settings": world.config.get_settings(), "tick": state["tick"],
+                "total_creature_num": state["total_creature_num"], "random": state["random"]}
+    arrays["metadata"] = np.array(json.dumps(metadata))
+
+    temporary_path = "%s.tmp" % path
+    with open(temporary_path, "wb") as checkpoint_file:
+        np.savez(checkpoint_file, **arrays)
+
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path, batched=True, events=None, compiled=False):
+    """
+    Resume a World saved by save_checkpoint. It continues exactly as the saved World would have
+
+    Args:
+        path: A string for the path of the file
+        batched: A boolean for whether the whole population is updated at once each tick
+        events: An EventLog to record what happens in the World, or None
+        compiled: A boolean for whether, when not batched, each Creature's Genome is compiled into a PackedNetwork
+
+    Returns:
+        The resumed World
+
+    Raises:
+        ValueError: The file was written by an incompatible version
+    """
+    with np.load(path) as checkpoint:
+        metadata = read_metadata(checkpoint)
+        state = {"tick": metadata["tick"], "total_creature_num": metadata["total_creature_num"],
+                 "random": metadata["random"], "board": {}, "population": {}}
+
+        for key in checkpoint.files:
+            section, separator, name = key.partition("_")
+            if section in ("board", "population"):
+                state[section][name] = checkpoint[key]
+
+    return World.World(Config.WorldConfig(**metadata["settings"]), batched, events, state, compiled)
+
+
+def read_config(path):
+    """
+    Read the settings of a World saved by save_checkpoint without loading the World
+
+    Args:
+        path: A string for the path of the file
+
+    Returns:
+        A WorldConfig with the saved settings
+
+    Raises:
+        ValueError: The file was written by an incompatible version
+    """
+    with np.load(path) as checkpoint:
+        return Config.WorldConfig(**read_metadata(checkpoint)["settings"])
+
+
+def read_metadata(checkpoint):
+    """
+    Read the values of a checkpoint that are not arrays
+
+    Args:
+        checkpoint: The NpzFile of the checkpoint
+
+    Returns:
+        A dictionary of the version, settings, tick, total_creature_num and states of the random streams
+
+    Raises:
+        ValueError: The checkpoint was written by an incompatible version
+    """
+    metadata = json.loads(str(checkpoint["metadata"]))
+
+    if metadata["version"] != version:
+        raise ValueError("Cannot load a version %s checkpoint, only version %d" % (metadata["version"], version))
+
+    return metadata
@@ -0,0 +1,124 @@
+import math
+
+import numpy as np
+
+import Activations
+import Utils
+
+
+class WorldConfig(object):
+    """
+    The settings of one World and the values derived from them, so several Worlds with different settings can exist
+    in one process
+
+    Attributes:
+        app_width: Width of the screen
+        app_height: Height of the screen
+        board_width: Width of the tile board
+        board_height: Height of the tile board
+        tiles_per_row: Amount of rows and columns of tiles
+        init_creature_num: Amount of creatures created when the World is created
+        birth_food: A number representing the amount of food a Creature is born with
+        birth_water: A number representing the amount of water a Creature is born with
+        mutation_rate: A float representing the chance of a mutation on a given weight at birth
+        regrowth_rate: An integer amount of food and water each tile regrows per tick
+        lazy_regrowth: A boolean for whether tiles only regrow when they are read or changed
+        seed: An integer to derive the World's random numbers from, or None for a random seed
+        terrain_octaves: An integer count of the octaves of the noise the tiles are created from
+        terrain_cache: A string for the directory to cache the tiles' noise in, or None to not cache it. Only used
+            with a seed, since without one the noise is never the same twice
+        activation: A string for the name in Activations.activations of the activation of every hidden neuron
+        output_activation: A string for the name in Activations.bounded of the activation of every output neuron
+        max_drawn_creatures: An integer count of the most creatures a window simulating the World in the background
+            can draw, which sets the size of the memory the Snapshots are shared through
+        tile_num: Amount of tiles on the board
+        tile_width: Width and height of a tile
+        vision: How far past its body a Creature sees
+    """
+
+    # The default value of every setting, every other attribute is derived from them
+    defaults = (("app_width", 1800),
+                ("app_height", 900),
+                ("board_width", 900),
+                ("board_height", 900),
+                ("tiles_per_row", 100),
+                ("init_creature_num", 100),
+                ("birth_food", 100),
+                ("birth_water", 100),
+                ("mutation_rate", .1),
+                ("regrowth_rate", 1),
+                ("lazy_regrowth", True),
+                ("seed", None),
+                ("terrain_octaves", 1),
+                ("terrain_cache", None),
+                ("activation", "sigmoid"),
+                ("output_activation", "sigmoid"),
+                ("max_drawn_creatures", 100000))
+
+    def __init__(self, **settings):
+        """
+        Initializes the WorldConfig
+
+        Args:
+            settings: The value of each setting to change from its default, by name
+
+        Raises:
+            ValueError: A setting is not in defaults, or an activation is unknown or not bounded for the outputs
+        """
+        for name, value in self.defaults:
+            setattr(self, name, value)
+
+        names = [name for name, value in self.defaults]
+        for name, value in settings.items():
+            if name not in names:
+                raise ValueError("Unknown setting %s" % name)
+
+            setattr(self, name, value)
+
+        Activations.get_activation(self.activation)
+        Activations.get_activation(self.output_activation, output=True)
+
+        self.tile_num = self.tiles_per_row ** 2
+        self.tile_width = self.board_width / self.tiles_per_row
+        self.vision = self.tile_width * 2
+
+    def get_settings(self):
+        """
+        Get the settings, without the values derived from them
+
+        Returns:
+            A dictionary mapping the name of each setting to its value
+        """
+        return dict((name, getattr(self, name)) for name, value in self.defaults)
+
+    def get_tile_index(self, x, y):
+        """
+        Get the index of the tile containing a position, clamped to the edge of the board
+
+        Args:
+            x: A float for the x position
+            y: A float for the y position
+
+        Returns:
+            An integer for the index of the tile
+        """
+        x_tile = Utils.clamp(math.floor(x / self.tile_width), 0, self.tiles_per_row - 1)
+        y_tile = Utils.clamp(math.floor(y / self.tile_width), 0, self.tiles_per_row - 1)
+
+        return Utils.clamp(x_tile + y_tile * self.tiles_per_row, 0, self.tile_num - 1)
+
+    def get_tile_indices(self, x, y):
+        """
+        The same as get_tile_index for arrays of positions
+
+        Args:
+            x: An array of x positions
+            y: An array of y positions
+
+        Returns:
+            An array of the index of the tile containing each position
+        """
+        x_tile = np.clip(np.floor(x / self.tile_width), 0, self.tiles_per_row - 1)
+        y_tile = np.clip(np.floor(y / self.tile_width), 0, self.tiles_per_row - 1)
+
+        return np.clip(x_tile + y_tile * self.tiles_per_row, 0, self.tile_num - 1).astype(int)
@@ -1,86 +1,109 @@
 import math
-import random
 
+import numpy as np
+
+import Genome
 import NeuralNetwork
-import Utils
 
-vision = Utils.tile_width * 2
+# The shape of every Creature's NeuralNetwork
+num_inputs = 13
+num_outputs = 8
+num_hidden_layers = 1
+num_neurons_per_hidden_layer = 11
+genome_sizes = Genome.layer_sizes(num_inputs, num_outputs, num_hidden_layers, num_neurons_per_hidden_layer)
+
+
+speed_coefficient = 10  # The maximum speed of a Creature
+
+fight_angle = math.pi / 4  # The most radians a Creature can fight away from the direction it is facing
+
+
+def column(name):
+    """
+    Create a property reading and writing a Creature's element of one of its World's Population arrays
+
+    Args:
+        name: A string for the name of the Population array
+
+    Returns:
+        A property for the Creature's value
+    """
+
+    def get_value(self):
+        return getattr(self.world.population, name)[self.slot].item()
+
+    def set_value(self, value):
+        getattr(self.world.population, name)[self.slot] = value
+
+    return property(get_value, set_value)
 
 
 class Creature(object):
     """
-    The creature object
+    The creature object. A Creature is a handle to its row in the World's Population, which stores its state
 
     Arguments:
-        tag: A string for the tag used for Tkinter identification and grouping
-        x: An integer for the x position between 0 and Utils.board_width
-        y: An integer for the y position between 0 and Utils.board_width
+        world: The World the Creature lives in
+        slot: An integer for the Creature's row in the World's Population, or None once it has died
+        number: An integer for the number the Creature was given at birth
+        x: A float for the x position between 0 and the board width
+        y: A float for the y position between 0 and the board height
         r: An integer for the red value between 0 and 255
         g: An integer for the green value between 0 and 255
         b: An integer for the blue value between 0 and 255
-        food: An integer representing the amount of food the creature has stored
-        water: An integer representing the amount of water the creature has stored
+        food: A float representing the amount of food the creature has stored
+        water: A float representing the amount of water the creature has stored
         direction_facing: An integer for the direction the creature is facing in degrees between 0 and 360
         speed: A float for the percentage of the maximum speed between 0 and 1
-        action: A float for the current action
-        radius: An integer for the radius
-        speed_coefficient: An integer for the maximum speed
-        canvas: A Canvas object for the application's canvas
+        action: An integer for the current action
+        radius: A float for the radius
         tile: A Tile object for the occupied Tile
         left_eye_rad: A float representing the angle in radians between the left eye and forward between 0 and pi/2
         right_eye_rad: A float representing teh angle in radians between the right eye and forward between 0 and pi/2
-        body: An oval for the body of the Creature
-        left_eye: A line for the Creature's left eye
-        right_eye: A line for the Creature's right eye
-        network: A NeuralNetwork object for the Neural Network used by the Creature
+        genome: A Genome viewing the weights and biases of the Creature's network in the Population
+        network: A NeuralNetwork object built from the genome when the World is neither batched nor staged, or a
+            PackedNetwork when the World is also compiled, otherwise None
     """
 
-    def __init__(self, canvas, tag, *args):
+    x = column("x")
+    y = column("y")
+    r = column("r")
+    g = column("g")
+    b = column("b")
+    food = column("food")
+    water = column("water")
+    direction_facing = column("direction_facing")
+    speed = column("speed")
+    action = column("action")
+    radius = column("radius")
+    left_eye_rad = column("left_eye_rad")
+    right_eye_rad = column("right_eye_rad")
+
+    def __init__(self, world, slot, number):
         """
-        Initializes the Creature
+        Initializes the Creature's handle. Its state must already be stored in the World's Population
 
         Args:
-            canvas: A Canvas object for the application's canvas
-            tag: A string for the tag used for Tkinter identification and grouping
-            args: A list of weights if the Creature has a parent
-        """
-        self.tag = "%s%d" % ("creature-", tag)
-        self.x = int(random.random() * Utils.board_width) if len(args) == 0 else args[1]
-        self.y = int(random.random() * Utils.board_height) if len(args) == 0 else args[2]
-        self.r = int(random.random() * 255)
-        self.g = int(random.random() * 255)
-        self.b = int(random.random() * 255)
-        self.food = Utils.birth_food
-        self.water = Utils.birth_water
-        self.direction_facing = int(random.random() * 360)
-        self.speed = random.random()
-        self.action = round(random.random())
-        self.radius = (self.food + self.water) / 30
-        self.speed_coefficient = 10
-        self.canvas = canvas
-        self.tile = Utils.get_tile(self.x, self.y)
-        self.left_eye_rad = eye_rad(random.random()) if len(args) == 0 else args[3]
-        self.right_eye_rad = eye_rad(random.random()) if len(args) == 0 else args[4]
-
-        rgb_hex = Utils.rgb_to_hex(self.r, self.g, self.b)
-        center_x = self.x + self.radius
-        center_y = self.y + self.radius
-        left_eye_pos = self.get_eye_pos(self.left_eye_rad)
-        right_eye_pos = self.get_eye_pos(self.right_eye_rad)
-
-        self.body = self.canvas.create_oval(self.x, self.y, self.x + self.radius * 2, self.y + self.radius * 2,
-                                            fill=rgb_hex, tags=self.tag)
-        self.left_eye = self.canvas.create_line(center_x, center_y, left_eye_pos[0], left_eye_pos[1], tags=self.tag)
-        self.right_eye = self.canvas.create_line(center_x, center_y, right_eye_pos[0], right_eye_pos[1], tags=self.tag)
-
-        self.network = NeuralNetwork.NeuralNetwork(13, 8, 1, 11)
-        self.network.create_network()
-        if len(args) == 0:
-            self.network.create_weights()
-        else:
-            self.network.create_weights(args[0])
-
-        print("Birth: %s" % self.tag)
+            world: The World the Creature lives in
+            slot: An integer for the Creature's row in the World's Population
+            number: An integer for the number the Creature was given at birth
+        """
+        self.world = world
+        self.slot = slot
+        self.number = number
+        self.tile = None
+        self.network = None
+
+        if not self.world.batched and not self.world.staged:
+            config = self.world.config
+            if self.world.compiled:
+                self.network = NeuralNetwork.PackedNetwork(self.genome, config.activation, config.output_activation)
+            else:
+                self.network = NeuralNetwork.from_genome(self.genome, config.activation, config.output_activation)
+
+    @property
+    def genome(self):
+        return Genome.Genome(self.world.population.sizes, self.world.population.genomes[self.slot])
 
     def get_eye_pos(self, eye_rads):
         """
@@ -97,14 +120,51 @@ class Creature(object):
         """
         center_x = self.x + self.radius
         center_y = self.y + self.radius
-        x = center_x + math.cos(self.direction_facing - eye_rads) * (self.radius + vision)
-        y = center_y + math.sin(self.direction_facing - eye_rads) * (self.radius + vision)
+        x = center_x + math.cos(self.direction_facing - eye_rads) * (self.radius + self.world.config.vision)
+        y = center_y + math.sin(self.direction_facing - eye_rads) * (self.radius + self.world.config.vision)
 
         return x, y
 
     def update(self):
         """
-        Update the Creature
+        Update the Creature by running its own network on what it senses. When its World is profiled, the update is
+        split into the phases sense, think, act, move and die
+        """
+        inputs = self.sense()
+        self.world.mark("sense")
+
+        outputs = self.think(inputs)
+        self.world.mark("think")
+
+        self.act(outputs)
+
+    def think(self, inputs):
+        """
+        Run the Creature's network on what it senses. A Creature of a staged World has no network of its own and runs
+        its row of the Population through the same calculation a batched World runs every row through, so its
+        outputs are exactly the same
+
+        Args:
+            inputs: A sequence of the inputs of the Creature's network
+
+        Returns:
+            A sequence of the outputs of the Creature's network
+        """
+        if self.network is not None:
+            return self.network.calculate_network(inputs)
+
+        config = self.world.config
+        population = self.world.population
+
+        return NeuralNetwork.calculate_population(population.sizes, population.genomes[self.slot:self.slot + 1],
+                                                  [inputs], config.activation, config.output_activation)[0]
+
+    def sense(self):
+        """
+        Look at the Creature and the tiles seen by its eyes
+
+        Returns:
+            A list of the inputs for the Creature's network
 
         Raises:
             IndexError: List index out of range
@@ -112,22 +172,45 @@ class Creature(object):
         left_eye = self.get_eye_pos(self.left_eye_rad)
         right_eye = self.get_eye_pos(self.right_eye_rad)
 
-        left_tile = Utils.get_tile(left_eye[0], left_eye[1])
-        right_tile = Utils.get_tile(right_eye[0], right_eye[1])
+        left_tile = self.world.get_tile(left_eye[0], left_eye[1])
+        right_tile = self.world.get_tile(right_eye[0], right_eye[1])
 
         # 0: Red, 1: Green, 2: Blue, 3: Food, 4: Water, 5: Left seen tile R, 6: Left seen tile G, 7: Left seen tile B,
         # 8: Right seen tile R, 9: Right seen tile G, 10: Right seen tile B, 11: Left eye radian, 12: Right eye radian
         inputs = [self.r, self.g, self.b, self.food, self.water, left_tile.temp, left_tile.food, left_tile.water,
                   right_tile.temp, right_tile.food, right_tile.water, self.left_eye_rad, self.right_eye_rad]
 
-        # 0: Red, 1: Green, 2: Blue, 3: Direction Facing, 4: Speed, 5: Action (eat, drink, reproduce, fight, sleep),
-        # 6: Left eye radian, 7: Right eye radian
-        outputs = self.network.calculate_network(inputs)
+        return inputs
+
+    def act(self, outputs):
+        """
+        Apply the outputs of the Creature's network then act, move and check if the Creature has died
+
+        Args:
+            outputs: A sequence of the outputs of the Creature's network
+        """
+        self.tile = self.world.get_tile(self.x, self.y)
+
+        self.apply_outputs(outputs)
 
-        self.tile = Utils.get_tile(self.x, self.y)
+        self.do_action()
+        self.world.mark("act")
 
-        # print("%s:%s" % (self.tag, str(outputs)))
+        self.move()
+        self.world.mark("move")
 
+        self.die()
+        self.world.mark("die")
+
+    def apply_outputs(self, outputs):
+        """
+        Set the Creature's colour, direction, speed, action and eyes from the outputs of its network
+
+        Args:
+            outputs: A sequence of the outputs of the Creature's network
+        """
+        # 0: Red, 1: Green, 2: Blue, 3: Direction Facing, 4: Speed, 5: Action (eat, drink, reproduce, fight, sleep),
+        # 6: Left eye radian, 7: Right eye radian
         self.r = int(outputs[0] * 255)
         self.g = int(outputs[1] * 255)
         self.b = int(outputs[2] * 255)
@@ -139,13 +222,6 @@ class Creature(object):
         self.left_eye_rad = eye_rad(outputs[6])
         self.right_eye_rad = eye_rad(outputs[7])
 
-        self.do_action()
-        self.move()
-
-        self.draw()
-
-        self.die()
-
     def do_action(self):
         """
         Do the current action based on what the action output neuron's value is:
@@ -176,7 +252,8 @@ class Creature(object):
         self.food += food_eaten
         self.tile.set_food(self.tile.food - food_eaten)
 
-        print("%s has eaten %d: food = %d" % (self.tag, food_eaten, self.food))
+        if self.world.events is not None:
+            self.world.events.record("eat", self.world.tick, id=self.number, amount=food_eaten)
 
     def drink(self):
         """
@@ -187,69 +264,58 @@ class Creature(object):
         self.water += water_drunk
         self.tile.set_water(self.tile.water - water_drunk)
 
-        print("%s has drunk %d: water = %d" % (self.tag, water_drunk, self.water))
+        if self.world.events is not None:
+            self.world.events.record("drink", self.world.tick, id=self.number, amount=water_drunk)
 
     def reproduce(self):
         """
         If the Creature is able to reproduce, have it reproduce by creating a Creature using some of its resources at
-        it's position with weights based off it's own
+        it's position with a mutated copy of it's Genome
         """
-        if self.food >= Utils.birth_food and self.water >= Utils.birth_water:
-            self.food -= Utils.birth_food
-            self.water -= Utils.birth_water
+        config = self.world.config
+        if self.food >= config.birth_food and self.water >= config.birth_water:
+            self.food -= config.birth_food
+            self.water -= config.birth_water
+
+            genome = self.genome.copy()
+            genome.mutate(config.mutation_rate, self.world.random.mutation)
 
-            Utils.creatures.append(
-                Creature(self.canvas, Utils.total_creature_num, self.network.get_weights(), self.x, self.y,
-                         self.left_eye_rad, self.right_eye_rad))
-            Utils.total_creature_num += 1
+            if self.world.events is not None:
+                self.world.events.record("reproduce", self.world.tick, id=self.number, food=self.food, water=self.water)
+
+            self.world.add_creatures([self.x], [self.y], [self.left_eye_rad], [self.right_eye_rad], [genome.buffer],
+                                     [self.number])
 
     def fight(self):
-        pass
+        """
+        Fight the closest Creature in front of the Creature that it can see, taking up to 30 of its food
+        """
+        target = self.world.grid.nearest_in_cones(np.array([self.slot]), self.radius + self.world.config.vision,
+                                                  [self.direction_facing], fight_angle)[0]
+
+        if target >= 0:
+            self.world.population.fight([self.slot], [target])
 
     def sleep(self):
         pass
 
     def die(self):
         if self.food <= 0 or self.water <= 0:
-            print("Death: %s with food = %d and water = %d" % (self.tag, self.food, self.water))
-
-            Utils.creatures.remove(self)
-            self.canvas.delete(self.tag)
-            del self
+            self.world.remove_creature(self)
 
     def move(self):
-        self.x += math.cos(self.direction_facing) * self.speed_coefficient * self.speed
-        self.y += math.sin(self.direction_facing) * self.speed_coefficient * self.speed
-
-        self.x %= Utils.board_width
-        self.y %= Utils.board_height
+        config = self.world.config
+        distance = speed_coefficient * self.speed
+        self.x = (self.x + math.cos(self.direction_facing) * distance) % config.board_width
+        self.y = (self.y + math.sin(self.direction_facing) * distance) % config.board_height
 
         # TODO: Improve resource consumption algorithm
-        self.food -= self.speed_coefficient / 4
-        self.water -= self.speed_coefficient / 4
+        self.food -= speed_coefficient / 4
+        self.water -= speed_coefficient / 4
 
-    def draw(self):
-        rgb_hex = Utils.rgb_to_hex(self.r, self.g, self.b)
-        center_x = self.x + self.radius
-        center_y = self.y + self.radius
-        left_eye = self.get_eye_pos(self.left_eye_rad)
-        right_eye = self.get_eye_pos(self.right_eye_rad)
-
-        self.canvas.itemconfig(self.body, fill=rgb_hex)
-        self.canvas.coords(self.body, self.x, self.y, self.x + self.radius * 2, self.y + self.radius * 2)
-
-        self.canvas.coords(self.left_eye, center_x, center_y, left_eye[0], left_eye[1])
-        self.canvas.coords(self.right_eye, center_x, center_y, right_eye[0], right_eye[1])
+        self.world.grid.update_creature(self.slot)
 
 
 def eye_rad(x):
     return x * (math.pi / 2)
 
-
-def create_creatures(num, canvas):
-    creature_list = []
-
-    for i in range(num):
-        creature_list.append(Creature(canvas, i))
-
-    return creature_list
@@ -0,0 +1,212 @@
+import os
+
+import numpy as np
+
+# Levels of events, an EventLog only records events at or above its level
+DEBUG = 10
+INFO = 20
+SUMMARY = 30
+
+# The level and the columns of each kind of event, every event also has the tick it happened on
+kinds = {
+    "birth": (INFO, (("id", np.int64), ("parent", np.int64), ("x", np.float64), ("y", np.float64))),
+    "death": (INFO, (("id", np.int64), ("age", np.int64), ("food", np.float64), ("water", np.float64),
+                     ("cause", np.int8))),
+    "eat": (DEBUG, (("id", np.int64), ("amount", np.float64))),
+    "drink": (DEBUG, (("id", np.int64), ("amount", np.float64))),
+    "reproduce": (INFO, (("id", np.int64), ("food", np.float64), ("water", np.float64))),
+    "tick": (SUMMARY, (("population", np.int64), ("births", np.int64), ("deaths", np.int64),
+                       ("mean_food", np.float64), ("mean_water", np.float64))),
+}
+
+# The causes of death
+STARVED = 1
+DEHYDRATED = 2
+STARVED_AND_DEHYDRATED = 3
+
+
+class EventLog(object):
+    """
+    Records what happens in a World as rows of structured arrays, one array type per kind of event. Rows are buffered
+    in memory and appended to one file per kind in a directory, or kept in memory when there is no directory. A World
+    without an EventLog skips every event, and an EventLog skips every kind below its level or sampled at 0
+
+    Attributes:
+        path: A string for the directory the events are written to, or None to keep them in memory
+        level: An integer for the lowest level of event recorded
+        sample_rates: A dictionary mapping each kind of event to the chance each event of that kind is recorded
+        buffer_size: An integer count of the rows of a kind to buffer before they are written
+        recorded: A set of the kinds of event that are recorded
+        buffers: A dictionary mapping each kind of event to a list of the arrays of rows not written yet
+        buffered: A dictionary mapping each kind of event to the count of rows not written yet
+        random: A Generator used for sampling, separate from the simulation's random numbers so recording events
+            does not change the simulation
+    """
+
+    def __init__(self, path=None, level=INFO, sample_rates=None, buffer_size=65536, seed=None):
+        """
+        Initializes the EventLog
+
+        Args:
+            path: A string for the directory to write the events to, which is created if needed, or None to keep them
+                in memory
+            level: An integer for the lowest level of event to record
+            sample_rates: A dictionary mapping kinds of event to the chance between 0 and 1 that each event of that
+                kind is recorded, where kinds not given are always recorded
+            buffer_size: An integer count of the rows of a kind to buffer before they are written
+            seed: An integer to seed sampling with, or None for a random seed
+
+        Raises:
+            ValueError: A kind in sample_rates is not in kinds
+        """
+        self.path = path
+        self.level = level
+        self.sample_rates = dict((kind, 1) for kind in kinds)
+        self.buffer_size = buffer_size
+        self.buffers = dict((kind, []) for kind in kinds)
+        self.buffered = dict((kind, 0) for kind in kinds)
+        self.random = np.random.default_rng(seed)
+
+        for kind, rate in (sample_rates or {}).items():
+            if kind not in kinds:
+                raise ValueError("Unknown event %s" % kind)
+
+            self.sample_rates[kind] = rate
+
+        self.recorded = set(kind for kind in kinds if kinds[kind][0] >= level and self.sample_rates[kind] > 0)
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def wants(self, kind):
+        """
+        Check if a kind of event is recorded, so the caller can skip gathering it
+
+        Args:
+            kind: A string for the kind of event
+
+        Returns:
+            A boolean for whether the kind of event is recorded
+        """
+        return kind in self.recorded
+
+    def record(self, kind, tick, **columns):
+        """
+        Record events of one kind at once, sampling them at the kind's sample rate
+
+        Args:
+            kind: A string for the kind of the events
+            tick: An integer for the tick the events happened on
+            columns: A scalar or sequence for the value of each column of kinds[kind] for each event, by name
+        """
+        if kind not in self.recorded:
+            return
+
+        names = [name for name, dtype in kinds[kind][1]]
+        # Scalar columns are repeated for every event, so an empty column means there are no events
+        values = np.broadcast_arrays(*[np.atleast_1d(columns[name]) for name in names])
+        num = len(values[0])
+        if num == 0:
+            return
+
+        rows = np.empty(num, dtype=get_dtype(kind))
+        rows["tick"] = tick
+        for name, value in zip(names, values):
+            rows[name] = value
+
+        rate = self.sample_rates[kind]
+        if rate < 1:
+            rows = rows[self.random.random(num) < rate]
+
+        if len(rows) > 0:
+            self.buffers[kind].append(rows)
+            self.buffered[kind] += len(rows)
+
+            if self.path is not None and self.buffered[kind] >= self.buffer_size:
+                self.flush(kind)
+
+    def get(self, kind):
+        """
+        Get the events of a kind kept in memory, or not written yet when writing to a directory
+
+        Args:
+            kind: A string for the kind of the events
+
+        Returns:
+            A structured array with a row for each event
+        """
+        return np.concatenate([np.empty(0, dtype=get_dtype(kind))] + self.buffers[kind])
+
+    def flush(self, kind=None):
+        """
+        Append the buffered events to their files. Does nothing when keeping events in memory
+
+        Args:
+            kind: A string for the kind of events to write, or None for every kind
+        """
+        if self.path is None:
+            return
+
+        for name in kinds if kind is None else (kind,):
+            if self.buffered[name] > 0:
+                with open(os.path.join(self.path, "%s.npy" % name), "ab") as events_file:
+                    np.save(events_file, self.get(name))
+
+                self.buffers[name] = []
+                self.buffered[name] = 0
+
+    def close(self):
+        """
+        Write every buffered event
+        """
+        self.flush()
+
+
+def get_dtype(kind):
+    """
+    Get the type of the rows of a kind of event
+
+    Args:
+        kind: A string for the kind of event
+
+    Returns:
+        A numpy dtype with a field for the tick and each column
+    """
+    return np.dtype([("tick", np.int64)] + list(kinds[kind][1]))
+
+
+def read_events(path, kind):
+    """
+    Read every event of a kind written to a directory by an EventLog
+
+    Args:
+        path: A string for the directory
+        kind: A string for the kind of the events
+
+    Returns:
+        A structured array with a row for each event, in the order they were recorded
+    """
+    chunks = [np.empty(0, dtype=get_dtype(kind))]
+    file_path = os.path.join(path, "%s.npy" % kind)
+
+    if os.path.exists(file_path):
+        with open(file_path, "rb") as events_file:
+            size = os.fstat(events_file.fileno()).st_size
+            while events_file.tell() < size:
+                chunks.append(np.load(events_file))
+
+    return np.concatenate(chunks)
+
+
+def get_causes(food, water):
+    """
+    Find why creatures died
+
+    Args:
+        food: An array of the food of the creatures
+        water: An array of the water of the creatures
+
+    Returns:
+        An array of STARVED, DEHYDRATED or STARVED_AND_DEHYDRATED for each Creature
+    """
+    return np.where(np.asarray(food) <= 0, STARVED, 0) + np.where(np.asarray(water) <= 0, DEHYDRATED, 0)
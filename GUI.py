@@ -1,37 +1,92 @@
-import random
-from tkinter import Tk, Canvas, Frame, BOTH
+import multiprocessing
+import time
+from tkinter import Tk, Canvas, Frame, PhotoImage, BOTH, NW, SW
 
-import Board
-import Creature
-import Test
-import Utils
+import numpy as np
+
+import Config
+import Profiler
+import Snapshot
+import World
 
 
 class App(Frame):
     """
-    The application
+    The application. The World is simulated at a fixed rate of ticks per second, independent of how often it is
+    drawn: every frame runs the ticks due since the last frame, then draws only the latest state. In the background
+    the World is instead simulated by another process, and every frame draws the newest Snapshot it has published.
+    When profiled, drawing is timed as the render phase and the rolling timings can be shown over the board
 
     Attributes:
         parent: Parent of the application
+        world_config: The WorldConfig of the World being simulated
         width: An integer for the width of the application
         height: An integer for the height of the application
+        ticks_per_second: A number for the rate the World is simulated at, or None for as fast as possible
+        fps: A number for the most frames drawn per second
+        events: The EventLog recording what happens in the World, or None
+        checkpointer: The Checkpointer saving the World, or None
+        profiler: The Profiler timing the World and drawing, or only drawing, a frame at a time, when the World is
+            simulated in the background, or None
+        overlay: The canvas text item showing the rolling timings of profiler, or None
+        overlay_time: A float for the time overlay was last updated in seconds
+        notice: The canvas text item saying how many creatures are not drawn when there are more than the
+            SnapshotBuffer holds, which is empty otherwise
+        accumulator: A float for the ticks that are due but have not been simulated yet
+        last_time: A float for the time of the last frame in seconds
         canvas: A Canvas object for the application's canvas
+        renderer: A CanvasRenderer drawing the world onto the canvas
+        snapshot: The last Snapshot drawn, or None before the first frame
+        drag_start: A tuple of the x and y pixel the mouse was last dragged from, or None
+        world: The World being simulated, or None when it is simulated in the background
+        buffer: The SnapshotBuffer the background process publishes to, or None
+        stop: An Event stopping the background process, or None
+        process: The Process simulating the World in the background, or None
     """
 
-    def __init__(self, parent, width, height):
+    # The most seconds of ticks that can be due at once, so a frame that falls behind skips ticks instead of making
+    # every later frame slower
+    max_lag = .25
+
+    # The seconds between updates of the overlay
+    overlay_interval = .5
+
+    def __init__(self, parent, world_config, ticks_per_second=10, fps=30, background=False, events=None,
+                 checkpointer=None, profiler=None, overlay=False):
         """
         Initializes the application
 
         Args:
             parent: An object for the parent of the application
-            width: An integer for the width of the application
-            height: An integer for the height of the application
+            world_config: The WorldConfig of the World to simulate, whose app_width and app_height size the
+                application
+            ticks_per_second: A number for the rate to simulate the World at, or None for as fast as possible
+            fps: A number for the most frames to draw per second
+            background: A boolean for whether to simulate the World in another process so drawing and simulating
+                never wait on each other
+            events: An EventLog to record what happens in the World, or None
+            checkpointer: A Checkpointer to save the World with while running and when closed, and to resume it from,
+                in which case the resumed World's settings replace world_config, or None
+            profiler: A Profiler to time the World and drawing with, or None. In the background it is copied to the
+                background process to time the World, and drawing is timed by a new Profiler a frame at a time
+            overlay: A boolean for whether to show the rolling timings of the profiler over the board
         """
         Frame.__init__(self, parent)  # Create the frame
 
+        if checkpointer is not None:
+            world_config = checkpointer.get_config(world_config)
+
         self.parent = parent
-        self.width = width
-        self.height = height
+        self.world_config = world_config
+        self.width = world_config.app_width
+        self.height = world_config.app_height
+        self.ticks_per_second = ticks_per_second
+        self.fps = fps
+        self.events = events
+        self.checkpointer = checkpointer
+        self.profiler = profiler
+        self.accumulator = 0
+        self.last_time = time.perf_counter()
 
         center_window(self)
 
@@ -39,52 +94,495 @@ class App(Frame):
         self.pack(fill=BOTH, expand=1)
 
         self.canvas = Canvas(self)
-        self.create_tiles()
-        Utils.creatures = Creature.create_creatures(Utils.init_creature_num, self.canvas)
+        self.renderer = CanvasRenderer(self.canvas, world_config)
+        self.snapshot = None
+
+        if background:
+            self.world = None
+            self.buffer = Snapshot.SnapshotBuffer(world_config.tiles_per_row, world_config.max_drawn_creatures)
+            self.buffer.request_view(*self.renderer.get_visible_tiles())
+            self.stop = multiprocessing.Event()
+            rate = multiprocessing.RawValue("d", 0 if ticks_per_second is None else ticks_per_second)
+            self.process = multiprocessing.Process(target=Snapshot.run_simulation,
+                                                   args=(self.buffer, world_config, rate, fps, self.stop, events,
+                                                         checkpointer, profiler),
+                                                   daemon=True)
+            self.process.start()
+
+            if profiler is not None:
+                self.profiler = Profiler.Profiler(profiler.window)
+        elif checkpointer is not None:
+            self.world = checkpointer.create_world(world_config, events=events)
+            self.buffer = None
+            self.stop = None
+            self.process = None
+        else:
+            self.world = World.World(world_config, events=events)
+            self.buffer = None
+            self.stop = None
+            self.process = None
+
+        if self.world is not None:
+            self.world.profiler = profiler
+
+        self.renderer.profiler = self.profiler
+
+        self.overlay = None
+        self.overlay_time = 0
+        if overlay and self.profiler is not None:
+            self.overlay = self.canvas.create_text(8, 8, anchor=NW, fill="white", font=("Courier", 10))
+
+        self.notice = self.canvas.create_text(8, self.height - 8, anchor=SW, fill="white", font=("Courier", 10))
+
+        self.parent.protocol("WM_DELETE_WINDOW", self.close)
 
         self.canvas.pack(fill=BOTH, expand=1)
 
+        self.drag_start = None
+        self.canvas.bind("<ButtonPress-1>", self.start_drag)
+        self.canvas.bind("<B1-Motion>", self.drag)
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom(event, 1.25 if event.delta > 0 else .8))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(event, 1.25))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(event, .8))
+
         self.update_app()
 
-    def create_tiles(self):
+    def update_app(self):
         """
-        Creates the world tiles
+        Main loop run once per frame. Draws the newest Snapshot published by the background process, or simulates the
+        ticks due since the last frame and draws the result
 
         Raises:
-            TypeError: Utils.tiles_per_row cannot be interpreted as an integer
-        """
-        r1 = random.random()
-        r2 = random.random()
-
-        for y in range(0, Utils.tiles_per_row):
-            for x in range(0, Utils.tiles_per_row):
-                tile = Board.Tile(x * Utils.tile_width,
-                                  y * Utils.tile_width,
-                                  0,
-                                  int(Test.perlin(x / Utils.tiles_per_row, y / Utils.tiles_per_row, r1) * 255),
-                                  int(Test.perlin(x / Utils.tiles_per_row, y / Utils.tiles_per_row, r2) * 255),
-                                  self.canvas)
-                Utils.tiles.append(tile)
-                tile.draw()
+            AttributeError: self.update_app is not a function
+        """
+        frame_time = time.perf_counter()
+        frame_length = 1 / self.fps
 
-    def update_app(self):
+        if self.world is None:
+            if self.profiler is not None:
+                self.profiler.begin()
+
+            self.buffer.request_view(*self.renderer.get_visible_tiles())
+            snapshot = self.buffer.read()
+        else:
+            self.step_world(frame_time, frame_length)
+
+            if self.profiler is not None:
+                self.profiler.begin()
+
+            snapshot = None
+            if self.snapshot is None or self.world.tick != self.snapshot.tick:
+                snapshot = Snapshot.take_snapshot(self.world, self.snapshot, *self.renderer.get_visible_tiles())
+
+        if snapshot is not None and (self.snapshot is None or snapshot.tick != self.snapshot.tick):
+            self.renderer.draw(snapshot)
+            self.snapshot = snapshot
+
+            self.parent.title("Evolution Simulator: %d creatures at tick %d" % (snapshot.population, snapshot.tick))
+
+            notice = ""
+            if len(snapshot.colours) < snapshot.population:
+                notice = "Only drawing %d of %d creatures" % (len(snapshot.colours), snapshot.population)
+            self.canvas.itemconfigure(self.notice, text=notice)
+            self.canvas.tag_raise(self.notice)
+
+            if self.profiler is not None:
+                self.profiler.mark("render")
+
+                # In the background the Profiler only times drawing, so each frame drawn stands in for a tick
+                if self.world is None:
+                    self.profiler.end(snapshot.tick)
+
+        if self.overlay is not None and frame_time - self.overlay_time >= self.overlay_interval:
+            self.canvas.itemconfigure(self.overlay, text=get_overlay_text(self.profiler.get_summary(),
+                                                                          "frame" if self.world is None else "tick"))
+            self.canvas.tag_raise(self.overlay)
+            self.overlay_time = frame_time
+
+        delay = frame_length - (time.perf_counter() - frame_time)
+        self.after(max(1, int(delay * 1000)), self.update_app)
+
+    def step_world(self, frame_time, frame_length):
         """
-        Main loop where all parts of the program that need updates are updated
+        Simulate the ticks due since the last frame, or as many as fit in the frame when running as fast as possible
 
-        Raises:
-            TypeError: self.init_creatures is not iterable
-            AttributeError: self.update_app is not a function
+        Args:
+            frame_time: A float for the time the frame started in seconds
+            frame_length: A float for the seconds between frames
+        """
+        if self.ticks_per_second is None:
+            self.world.step()
+            while time.perf_counter() - frame_time < frame_length:
+                self.world.step()
+        else:
+            elapsed = frame_time - self.last_time
+            self.accumulator = min(self.accumulator + elapsed * self.ticks_per_second,
+                                   max(1, self.max_lag * self.ticks_per_second))
+
+            ticks = int(self.accumulator)
+            self.accumulator -= ticks
+            self.world.step(ticks)
+
+        if self.checkpointer is not None:
+            self.checkpointer.update(self.world)
+
+        self.last_time = frame_time
+
+    def start_drag(self, event):
+        self.drag_start = (event.x, event.y)
+
+    def drag(self, event):
+        """
+        Pan the Viewport with the mouse
+
+        Args:
+            event: The Event of the mouse moving with its button held
+        """
+        self.renderer.viewport.pan(event.x - self.drag_start[0], event.y - self.drag_start[1])
+        self.drag_start = (event.x, event.y)
+        self.redraw()
+
+    def zoom(self, event, factor):
+        """
+        Zoom the Viewport around the mouse
+
+        Args:
+            event: The Event of the mouse wheel turning
+            factor: A float to multiply the scale of the Viewport by
+        """
+        self.renderer.viewport.zoom(factor, event.x, event.y)
+        self.redraw()
+
+    def redraw(self):
+        """
+        Draw the last Snapshot again after the Viewport changed, without waiting for the next frame. A World
+        simulated here is snapshotted again for the tiles that came into view, while in the background they arrive
+        with the next Snapshot published
+        """
+        if self.world is not None and self.snapshot is not None:
+            self.snapshot = Snapshot.take_snapshot(self.world, self.snapshot, *self.renderer.get_visible_tiles())
+
+        if self.snapshot is not None:
+            self.renderer.draw(self.snapshot)
+
+    def close(self):
+        """
+        Stop the background process, or save the World and write the recorded events, then close the application
+        """
+        if self.process is not None:
+            self.stop.set()
+            self.process.join(5)
+        else:
+            if self.checkpointer is not None:
+                self.checkpointer.save(self.world)
+
+            if self.events is not None:
+                self.events.close()
+
+            if self.profiler is not None:
+                self.profiler.close(self.world.tick)
+
+        self.parent.destroy()
+
+
+class Viewport(object):
+    """
+    The rectangle of the board shown on the canvas
+
+    Attributes:
+        width: An integer for the width of the Viewport in pixels
+        height: An integer for the height of the Viewport in pixels
+        x: A float for the x coordinate of the board at the left edge of the Viewport
+        y: A float for the y coordinate of the board at the top edge of the Viewport
+        scale: A float for the pixels per unit of the board
+        min_scale: A float for the smallest scale, zoomed furthest out
+        max_scale: A float for the largest scale, zoomed furthest in
+    """
+
+    def __init__(self, width, height, scale, min_scale, max_scale):
+        """
+        Initializes the Viewport showing the top left of the board
+
+        Args:
+            width: An integer for the width of the Viewport in pixels
+            height: An integer for the height of the Viewport in pixels
+            scale: A float for the pixels per unit of the board
+            min_scale: A float for the smallest scale
+            max_scale: A float for the largest scale
+        """
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+        self.scale = scale
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+
+    def get_state(self):
+        """
+        Get the position and scale, which together decide what is shown
+
+        Returns:
+            A tuple of x, y and scale
         """
-        for i in Utils.creatures:
-            i.update()
+        return self.x, self.y, self.scale
 
-        for tile in Utils.tile_update:
-            tile.draw()
-            Utils.tile_update.remove(tile)
+    def pan(self, dx, dy):
+        """
+        Move the board with the mouse
+
+        Args:
+            dx: A number for the pixels to move the board right
+            dy: A number for the pixels to move the board down
+        """
+        self.x -= dx / self.scale
+        self.y -= dy / self.scale
+
+    def zoom(self, factor, pixel_x, pixel_y):
+        """
+        Change the scale, keeping the point of the board under a pixel in place
+
+        Args:
+            factor: A float to multiply the scale by
+            pixel_x: A number for the x coordinate of the pixel in the Viewport
+            pixel_y: A number for the y coordinate of the pixel in the Viewport
+        """
+        scale = min(max(self.scale * factor, self.min_scale), self.max_scale)
+
+        self.x += pixel_x / self.scale - pixel_x / scale
+        self.y += pixel_y / self.scale - pixel_y / scale
+        self.scale = scale
 
-        print("%d Creatures alive" % len(Utils.creatures))
 
-        self.after(100, self.update_app)
+class CanvasRenderer(object):
+    """
+    Draws Snapshots of a World onto a Tkinter canvas through a Viewport. The board is one image the size of the
+    Viewport, rebuilt from the colours of the visible tiles whenever one changes or the Viewport moves. Snapshots only
+    hold the tiles under a pixel, which are kept in a copy of the board's colours the image is built from, and each
+    creature in view is a glyph of an oval with two lines for eyes. Glyph i draws the i-th Creature in view, glyphs
+    past the last are hidden and kept to be reused. Every glyph is moved in a single Tcl script. When zoomed out so
+    far that a tile is smaller than heatmap_tile_pixels, creatures are drawn as a heatmap of their density over the
+    board instead
+
+    Attributes:
+        canvas: A Canvas object to draw on
+        config: The WorldConfig of the World drawn
+        viewport: The Viewport of the board shown
+        image: A PhotoImage of the board in the Viewport
+        image_item: The canvas item showing image
+        pixel_rows: An array of the row of the tile under each row of pixels, or -1 for black
+        pixel_columns: An array of the column of the tile under each column of pixels, or -1 for black
+        visible_rows: An array of the rows of the tiles under a pixel in increasing order
+        visible_columns: An array of the columns of the tiles under a pixel in increasing order
+        pixel_view: A tuple of the state of the Viewport the pixel tiles were found for, or None
+        tiles: A 3D array of bytes indexed by [row, column, channel] of the colour of each tile as of the last
+            Snapshot holding it, black before any has
+        board_tick: An integer for the board tick of the Snapshot the image was last drawn from, or None
+        view: A tuple of the state of the Viewport the image was last drawn for, or None
+        items: A list with a tuple of the oval, left eye line and right eye line of each glyph
+        fills: An array of the colour each glyph's oval was last filled with, packed into an integer as 0xRRGGBB, or
+            -1 if it has not been filled
+        visible: An integer count of the glyphs that are shown, which are always the first glyphs
+        profiler: A Profiler counting the calls into Tk that draw on the canvas, or None
+    """
+
+    # The fewest pixels a tile can be wide before creatures are drawn as a heatmap
+    heatmap_tile_pixels = 2
+
+    def __init__(self, canvas, config):
+        """
+        Initializes the CanvasRenderer with a Viewport of the whole board, at most the size of the application
+
+        Args:
+            canvas: A Canvas object to draw on
+            config: The WorldConfig of the World to draw
+        """
+        width = min(config.board_width, config.app_width)
+        height = min(config.board_height, config.app_height)
+        scale = min(width / config.board_width, height / config.board_height)
+
+        self.canvas = canvas
+        self.config = config
+        self.viewport = Viewport(width, height, scale, scale / 16, 64 / config.tile_width)
+        self.image = PhotoImage(master=canvas, width=width, height=height)
+        self.image_item = canvas.create_image(0, 0, anchor=NW, image=self.image)
+        self.pixel_rows = None
+        self.pixel_columns = None
+        self.visible_rows = None
+        self.visible_columns = None
+        self.pixel_view = None
+        self.tiles = np.zeros((config.tiles_per_row, config.tiles_per_row, 3), dtype=np.uint8)
+        self.board_tick = None
+        self.view = None
+        self.items = []
+        self.fills = np.zeros(0, dtype=int)
+        self.visible = 0
+        self.profiler = None
+
+    def count_calls(self, amount):
+        """
+        Count calls into Tk that draw on the canvas if profiled
+
+        Args:
+            amount: An integer count of the calls
+        """
+        if self.profiler is not None:
+            self.profiler.count("canvas_calls", amount)
+
+    def get_visible_tiles(self):
+        """
+        Get the tiles under a pixel of the Viewport, which are the only tiles a Snapshot needs to hold
+
+        Returns:
+            A tuple of arrays of the rows and columns of the tiles in increasing order
+        """
+        viewport = self.viewport
+
+        if viewport.get_state() != self.pixel_view:
+            tile_width = self.config.tile_width
+            outline = viewport.scale * tile_width >= 4
+            self.pixel_rows = Snapshot.get_pixel_tiles(viewport.height, viewport.y, viewport.scale, tile_width,
+                                                       self.config.tiles_per_row, outline)
+            self.pixel_columns = Snapshot.get_pixel_tiles(viewport.width, viewport.x, viewport.scale, tile_width,
+                                                          self.config.tiles_per_row, outline)
+            self.visible_rows = np.unique(self.pixel_rows[self.pixel_rows >= 0])
+            self.visible_columns = np.unique(self.pixel_columns[self.pixel_columns >= 0])
+            self.pixel_view = viewport.get_state()
+
+        return self.visible_rows, self.visible_columns
+
+    def draw(self, snapshot):
+        """
+        Bring the canvas up to date with a Snapshot. The board is only redrawn if a tile changed since it was last
+        drawn, the Viewport moved or it shows a heatmap
+
+        Args:
+            snapshot: The Snapshot to draw
+        """
+        viewport = self.viewport
+        heatmap = viewport.scale * self.config.tile_width < self.heatmap_tile_pixels
+        moved = viewport.get_state() != self.view
+
+        self.get_visible_tiles()
+
+        if snapshot.board_tick != self.board_tick or moved:
+            self.tiles[np.ix_(snapshot.tile_rows, snapshot.tile_columns)] = snapshot.rgb
+
+        if heatmap:
+            self.draw_heatmap(snapshot)
+            self.draw_creatures(np.zeros((0, 12)), np.zeros(0, dtype=int))
+        else:
+            if snapshot.board_tick != self.board_tick or moved:
+                self.image.configure(data=Snapshot.get_ppm(self.tiles, self.pixel_rows, self.pixel_columns),
+                                     format="PPM")
+                self.count_calls(1)
+
+            # Only the creatures whose glyph overlaps the Viewport, moved into pixels
+            x = (snapshot.coords[:, 0::2] - viewport.x) * viewport.scale
+            y = (snapshot.coords[:, 1::2] - viewport.y) * viewport.scale
+            shown = ((x.max(axis=1) >= 0) & (x.min(axis=1) < viewport.width) & (y.max(axis=1) >= 0) &
+                     (y.min(axis=1) < viewport.height))
+
+            coords = np.empty((np.count_nonzero(shown), 12))
+            coords[:, 0::2] = x[shown]
+            coords[:, 1::2] = y[shown]
+            self.draw_creatures(coords, snapshot.colours[shown])
+
+        self.board_tick = None if heatmap else snapshot.board_tick
+        self.view = viewport.get_state()
+
+    def draw_heatmap(self, snapshot):
+        """
+        Draw the board with the density of creatures over it. The counts are taken over squares of tiles at least a
+        pixel wide so no Creature is missed, and each pixel shows the tile under it tinted by the count of its square
+
+        Args:
+            snapshot: The Snapshot to draw
+        """
+        tiles_per_row = self.config.tiles_per_row
+        size = max(1, int(np.ceil(1 / (self.viewport.scale * self.config.tile_width))))
+        squares_per_row = -(-tiles_per_row // size)
+
+        # The square under the center of each Creature
+        rows = np.clip(np.floor(snapshot.coords[:, 5] / self.config.tile_width).astype(int), 0, tiles_per_row - 1)
+        columns = np.clip(np.floor(snapshot.coords[:, 4] / self.config.tile_width).astype(int), 0, tiles_per_row - 1)
+        counts = np.bincount((rows // size) * squares_per_row + columns // size, minlength=squares_per_row ** 2)
+        heat = (np.log1p(counts) / np.log1p(max(1, counts.max()))).reshape(squares_per_row, squares_per_row)
+
+        # The tile and heat under each pixel, where pixels off the board are left black by get_ppm
+        pixel_rows = np.maximum(self.pixel_rows, 0)[:, np.newaxis]
+        pixel_columns = np.maximum(self.pixel_columns, 0)
+        tint = .7 * heat[pixel_rows // size, pixel_columns // size][:, :, np.newaxis]
+        rgb = self.tiles[pixel_rows, pixel_columns] * (1 - tint) + np.array([255, 230, 0]) * tint
+
+        pixels_rows = np.where(self.pixel_rows >= 0, np.arange(len(self.pixel_rows)), -1)
+        pixels_columns = np.where(self.pixel_columns >= 0, np.arange(len(self.pixel_columns)), -1)
+        self.image.configure(data=Snapshot.get_ppm(rgb.astype(np.uint8), pixels_rows, pixels_columns), format="PPM")
+        self.count_calls(1)
+
+    def draw_creatures(self, coords, colours):
+        """
+        Move a glyph to every Creature shown, and refill the ovals whose colour changed, with one call into Tcl
+
+        Args:
+            coords: An array of shape (creatures, 12) of the coordinates of each Creature's glyph in pixels
+            colours: An array of the colour of each Creature packed into an integer as 0xRRGGBB
+        """
+        size = len(colours)
+        self.count_calls(3 * max(0, size - len(self.items)))
+        while len(self.items) < size:
+            tag = get_glyph_tag(len(self.items))
+            self.items.append((self.canvas.create_oval(0, 0, 0, 0, tags=tag),
+                               self.canvas.create_line(0, 0, 0, 0, tags=tag),
+                               self.canvas.create_line(0, 0, 0, 0, tags=tag)))
+
+        if len(self.fills) < size:
+            self.fills = np.concatenate((self.fills, np.full(size - len(self.fills), -1, dtype=int)))
+
+        path = str(self.canvas)
+        commands = []
+        for glyph in range(size, self.visible):
+            commands.append("%s itemconfigure %s -state hidden" % (path, get_glyph_tag(glyph)))
+        for glyph in range(self.visible, size):
+            commands.append("%s itemconfigure %s -state normal" % (path, get_glyph_tag(glyph)))
+        self.visible = size
+
+        for (body, left_eye, right_eye), values in zip(self.items, coords.tolist()):
+            commands.append("%s coords %d %.2f %.2f %.2f %.2f" % ((path, body) + tuple(values[0:4])))
+            commands.append("%s coords %d %.2f %.2f %.2f %.2f" % ((path, left_eye) + tuple(values[4:8])))
+            commands.append("%s coords %d %.2f %.2f %.2f %.2f" % ((path, right_eye) + tuple(values[8:12])))
+
+        changed = np.flatnonzero(colours != self.fills[:size])
+        self.fills[changed] = colours[changed]
+        for glyph, colour in zip(changed.tolist(), colours[changed].tolist()):
+            commands.append("%s itemconfigure %d -fill #%06x" % (path, self.items[glyph][0], colour))
+
+        if len(commands) > 0:
+            self.canvas.tk.eval("\n".join(commands))
+            self.count_calls(len(commands))
+
+
+def get_overlay_text(summary, unit="tick"):
+    """
+    Lay out a summary of a Profiler as lines of text
+
+    Args:
+        summary: A dictionary from Profiler.get_summary
+        unit: A string for what each tick of the Profiler stands for
+
+    Returns:
+        A string with a line for the mean milliseconds of each phase and the mean of each counter
+    """
+    lines = ["ms per %s over %d %ss" % (unit, summary["ticks"], unit)]
+    lines.extend("%-12s %8.2f" % (phase, value) for phase, value in summary["phases"].items())
+    lines.append("per %s" % unit)
+    lines.extend("%-12s %8.1f" % (name, value) for name, value in sorted(summary["counts"].items()))
+
+    return "\n".join(lines)
+
+
+def get_glyph_tag(glyph):
+    return "%s%d" % ("glyph-", glyph)
 
 
 def center_window(app):
@@ -106,10 +604,22 @@ def center_window(app):
     app.parent.geometry("%dx%d+%d+%d" % (app.width, app.height, x, y))
 
 
-def init():
+def init(config=None, ticks_per_second=10, fps=30, background=False, events=None, checkpointer=None, profiler=None,
+         overlay=False):
     """
     Initializes the application
+
+    Args:
+        config: The WorldConfig of the World to simulate, or None for the default settings
+        ticks_per_second: A number for the rate to simulate the World at, or None for as fast as possible
+        fps: A number for the most frames to draw per second
+        background: A boolean for whether to simulate the World in another process
+        events: An EventLog to record what happens in the World, or None
+        checkpointer: A Checkpointer to save and resume the World with, or None
+        profiler: A Profiler to time the World and drawing with, or None
+        overlay: A boolean for whether to show the rolling timings of the profiler over the board
     """
     root = Tk()
-    App(root, Utils.app_width, Utils.app_height)
+    App(root, Config.WorldConfig() if config is None else config, ticks_per_second, fps, background, events,
+        checkpointer, profiler, overlay)
     root.mainloop()
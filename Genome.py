@@ -0,0 +1,151 @@
+import numpy as np
+
+
+class Genome(object):
+    """
+    The weights and biases of a network stored in one contiguous buffer. Each non-input layer's weights are stored
+    row by row followed by its biases, and are exposed as views so changing a view changes the buffer
+
+    Attributes:
+        sizes: A tuple of the neuron count of each layer, starting with the input layer
+        buffer: A 1D array holding every weight and bias
+        weights: A list with a view of shape (neurons, inputs) into buffer for the weights of each non-input layer
+        biases: A list with a view of shape (neurons,) into buffer for the biases of each non-input layer
+    """
+
+    def __init__(self, sizes, buffer=None):
+        """
+        Initializes the Genome
+
+        Args:
+            sizes: A sequence of the neuron count of each layer, starting with the input layer
+            buffer: A 1D array of length genome_size(sizes) to use as the buffer, or None for all zeros
+        """
+        self.sizes = tuple(sizes)
+        self.buffer = np.zeros(genome_size(self.sizes)) if buffer is None else buffer
+        self.weights = []
+        self.biases = []
+
+        for weights_start, biases_start, num_neurons, num_inputs in layout(self.sizes):
+            self.weights.append(self.buffer[weights_start:biases_start].reshape(num_neurons, num_inputs))
+            self.biases.append(self.buffer[biases_start:biases_start + num_neurons])
+
+    def copy(self):
+        """
+        Copy the Genome
+
+        Returns:
+            A new Genome with a copy of the buffer
+        """
+        return Genome(self.sizes, self.buffer.copy())
+
+    def mutate(self, mutation_rate, generator):
+        """
+        Replace each weight and bias with a random number between -1 and 1 with a chance of mutation_rate
+
+        Args:
+            mutation_rate: A float for the chance of a mutation on a given weight or bias
+            generator: A Generator to draw the random numbers from
+        """
+        mutate(self.buffer, mutation_rate, generator)
+
+    def crossover(self, other, generator):
+        """
+        Create a child Genome taking each weight and bias from either parent with equal chance
+
+        Args:
+            other: A Genome with the same sizes
+            generator: A Generator to draw the random numbers from
+
+        Returns:
+            A new Genome mixing the two parents
+
+        Raises:
+            ValueError: The Genomes have different sizes
+        """
+        if self.sizes != other.sizes:
+            raise ValueError("Cannot cross a Genome of sizes %s with one of sizes %s" % (self.sizes, other.sizes))
+
+        from_self = generator.random(len(self.buffer)) < .5
+
+        return Genome(self.sizes, np.where(from_self, self.buffer, other.buffer))
+
+
+def layer_sizes(num_inputs, num_outputs, num_hidden_layers, num_neurons_per_hidden_layer):
+    """
+    Get the neuron count of each layer of a network
+
+    Args:
+        num_inputs: An integer count of the input neurons
+        num_outputs: An integer count of the output neurons
+        num_hidden_layers: An integer count of the hidden layers
+        num_neurons_per_hidden_layer: An integer count of the neurons in a hidden layer
+
+    Returns:
+        A tuple of the neuron count of each layer, starting with the input layer
+    """
+    return (num_inputs,) + (num_neurons_per_hidden_layer,) * num_hidden_layers + (num_outputs,)
+
+
+def layout(sizes):
+    """
+    Get where each non-input layer is stored in a Genome's buffer
+
+    Args:
+        sizes: A sequence of the neuron count of each layer, starting with the input layer
+
+    Returns:
+        A list with a tuple of (weights start, biases start, neurons, inputs per neuron) for each non-input layer
+    """
+    layers = []
+    start = 0
+
+    for num_inputs, num_neurons in zip(sizes[:-1], sizes[1:]):
+        layers.append((start, start + num_neurons * num_inputs, num_neurons, num_inputs))
+        start += num_neurons * (num_inputs + 1)
+
+    return layers
+
+
+def genome_size(sizes):
+    """
+    Get the length of the buffer of a Genome
+
+    Args:
+        sizes: A sequence of the neuron count of each layer, starting with the input layer
+
+    Returns:
+        An integer count of the weights and biases in the network
+    """
+    return sum(num_neurons * (num_inputs + 1) for num_inputs, num_neurons in zip(sizes[:-1], sizes[1:]))
+
+
+def mutate(buffers, mutation_rate, generator):
+    """
+    Replace each element of an array of Genome buffers with a random number between -1 and 1 with a chance of
+    mutation_rate. Each buffer draws all of its random numbers before the next, so mutating a stack of buffers at once
+    draws the same numbers as mutating them one at a time in the same order
+
+    Args:
+        buffers: An array of any shape holding Genome buffers, such as one buffer or a stack of buffers as rows
+        mutation_rate: A float for the chance of a mutation on a given weight or bias
+        generator: A Generator to draw the random numbers from
+    """
+    for index in np.ndindex(buffers.shape[:-1]):
+        buffer = buffers[index]
+        mutated = generator.random(buffer.shape) < mutation_rate
+        buffer[mutated] = generator.random(np.count_nonzero(mutated)) * 2 - 1
+
+
+def random_genome(sizes, generator):
+    """
+    Create a Genome with every weight and bias a random number between -1 and 1
+
+    Args:
+        sizes: A sequence of the neuron count of each layer, starting with the input layer
+        generator: A Generator to draw the random numbers from
+
+    Returns:
+        A new Genome
+    """
+    return Genome(sizes, generator.random(genome_size(sizes)) * 2 - 1)
@@ -0,0 +1,115 @@
+import multiprocessing
+
+import numpy as np
+
+import Config
+import World
+
+
+def run_islands(num_islands, ticks, migration_interval, num_migrants, seed=None, config=None):
+    """
+    Evolve several independent Worlds, each in its own process. Every migration_interval ticks each island sends
+    copies of its fittest creatures to the next island in a ring, which adds them at random positions
+
+    Args:
+        num_islands: An integer count of the islands
+        ticks: An integer count of the ticks to simulate on each island
+        migration_interval: An integer count of the ticks between migrations
+        num_migrants: An integer count of the creatures each island sends at every migration
+        seed: An integer to seed the islands with, where island i uses seed + i, or None for random seeds
+        config: The WorldConfig every island is created with, except for its seed, or None for the default settings
+
+    Returns:
+        A list with a list for each island of its population after every migration
+    """
+    pipes = []
+    processes = []
+    for i in range(num_islands):
+        parent_end, child_end = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=run_island, args=(child_end, ticks, migration_interval, num_migrants,
+                                                                   None if seed is None else seed + i, config))
+        process.start()
+
+        pipes.append(parent_end)
+        processes.append(process)
+
+    populations = [[] for i in range(num_islands)]
+    for epoch in range(int(np.ceil(ticks / migration_interval))):
+        emigrants = []
+        for i, pipe in enumerate(pipes):
+            population, migrants = pipe.recv()
+
+            populations[i].append(population)
+            emigrants.append(migrants)
+
+        for i, pipe in enumerate(pipes):
+            pipe.send(emigrants[i - 1])
+
+        print("Tick %d: %s creatures alive" % (min((epoch + 1) * migration_interval, ticks),
+                                               ", ".join(str(population[-1]) for population in populations)))
+
+    for process in processes:
+        process.join()
+
+    return populations
+
+
+def run_island(pipe, ticks, migration_interval, num_migrants, seed, config):
+    """
+    Evolve one island. Runs in its own process
+
+    Args:
+        pipe: A Connection to the process coordinating the islands
+        ticks: An integer count of the ticks to simulate
+        migration_interval: An integer count of the ticks between migrations
+        num_migrants: An integer count of the creatures to send at every migration
+        seed: An integer to seed the island's random numbers with, or None for a random seed
+        config: The WorldConfig to create the island with, except for its seed, or None for the default settings
+    """
+    settings = {} if config is None else config.get_settings()
+    settings["seed"] = seed
+
+    world = World.World(Config.WorldConfig(**settings))
+
+    while world.tick < ticks:
+        world.step(min(migration_interval, ticks - world.tick))
+
+        pipe.send((world.population.size, get_emigrants(world, num_migrants)))
+        add_immigrants(world, pipe.recv())
+
+    pipe.close()
+
+
+def get_emigrants(world, num_migrants):
+    """
+    Copy the fittest creatures of a World, judged by their food and water
+
+    Args:
+        world: The World to take the creatures from
+        num_migrants: An integer count of the creatures to copy
+
+    Returns:
+        A tuple of arrays of the left eye radians, right eye radians and Genome buffers of the creatures
+    """
+    population = world.population
+    fitness = np.minimum(population.food[:population.size], population.water[:population.size])
+    fittest = np.argsort(-fitness, kind="stable")[:num_migrants]
+
+    return population.left_eye_rad[fittest], population.right_eye_rad[fittest], population.genomes[fittest]
+
+
+def add_immigrants(world, migrants):
+    """
+    Add creatures from another island to a World at random positions drawn from the World's placement stream
+
+    Args:
+        world: The World to add the creatures to
+        migrants: A tuple of arrays of the left eye radians, right eye radians and Genome buffers of the creatures
+    """
+    left_eye_rad, right_eye_rad, genomes = migrants
+    num = len(genomes)
+
+    if num > 0:
+        world.add_creatures(world.random.placement.random(num) * world.config.board_width,
+                            world.random.placement.random(num) * world.config.board_height,
+                            left_eye_rad, right_eye_rad, genomes)
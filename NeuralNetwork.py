@@ -1,6 +1,7 @@
-import random
-import math
-import Utils
+import numpy as np
+
+import Activations
+import Genome
 
 
 class Neuron(object):
@@ -13,18 +14,23 @@ class Neuron(object):
         bias: A float for the bias of the neuron
         delta: A float for the delta (error) of the neuron
         output: A float of the output of the neuron
+        generator: A Generator to draw the neuron's random numbers from, or None if it has none
     """
 
-    def __init__(self, inputs):
+    def __init__(self, inputs, generator, weights=None, bias=None):
         """
         Initializes the Neuron
 
         Args:
             inputs: An integer count of the inputs of the neuron
+            generator: A Generator to draw the neuron's random numbers from, which may be None if bias is given
+            weights: A list of the weights of the neuron, or None to create them later
+            bias: A float for the bias of the neuron, or None for a random one between -1 and 1
         """
         self.inputs = inputs
-        self.weights = []
-        self.bias = random.random() * 2 - 1
+        self.weights = [] if weights is None else weights
+        self.generator = generator
+        self.bias = generator.random() * 2 - 1 if bias is None else bias
         self.delta = 0
         self.output = 0
 
@@ -36,20 +42,22 @@ class Neuron(object):
             TypeError: self.inputs cannot be interpreted as an integer
         """
         for x in range(0, self.inputs):
-            self.weights.append(random.random() * 2 - 1)
+            self.weights.append(self.generator.random() * 2 - 1)
 
-    def set_weight(self, weights):
+    def set_weight(self, weights, mutation_rate):
         """
         Creates weights using predetermined values. Based on the mutation rate,
         there is a chance that mutations occur causing random rates to be replaced with random numbers between -1 and 1.
 
         Args:
             weights: A list representing the predetermined value for weights
+            mutation_rate: A float representing the chance of a mutation on a given weight
 
         Raises
             TypeError: weights is not iterable
         """
-        weights = list(map(lambda x: x if random.random() > Utils.mutation_rate else random.random() * 2 - 1, weights))
+        weights = list(map(lambda x: x if self.generator.random() > mutation_rate else self.generator.random() * 2 - 1,
+                           weights))
 
         self.weights = weights
 
@@ -63,31 +71,39 @@ class NeuronLayer(object):
         neurons: A list of the Neurons in the layer
     """
 
-    def __init__(self, num_neurons, inputs_per_neuron):
+    def __init__(self, num_neurons, inputs_per_neuron, generator, weights=None, biases=None):
         """
         Initializes the Neuron
 
         Args:
             num_neurons: An integer count of the neurons in the layer
             inputs_per_neuron: An integer count of the amount of inputs of each neuron in the layer
+            generator: A Generator to draw the neurons' random numbers from, which may be None if biases are given
+            weights: A list of the list of weights of each neuron, or None to create them later
+            biases: A list of the bias of each neuron, or None for random ones
         """
         self.num_neurons = num_neurons
         self.neurons = []
 
-        self.create_neurons(inputs_per_neuron)
+        if biases is None:
+            self.create_neurons(inputs_per_neuron, generator)
+        else:
+            for neuron_weights, bias in zip(weights or [None] * num_neurons, biases):
+                self.neurons.append(Neuron(inputs_per_neuron, generator, neuron_weights, bias))
 
-    def create_neurons(self, inputs):
+    def create_neurons(self, inputs, generator):
         """
         Creates the neurons and adds them to the list neurons
 
         Args:
             inputs: An integer count of the amount of inputs of each neuron in the layer
+            generator: A Generator to draw the neurons' random numbers from
 
         Raises:
             TypeError: self.num_neurons cannot be interpreted as an integer
         """
         for i in range(0, self.num_neurons):
-            self.neurons.append(Neuron(inputs))
+            self.neurons.append(Neuron(inputs, generator))
 
 
 class NeuralNetwork(object):
@@ -100,9 +116,13 @@ class NeuralNetwork(object):
         num_hidden_layers: An integer count of the hidden layers
         num_neurons_per_hidden_layer: An integer count of the neurons in a hidden layer
         layers: A list of each NeuronLayer
+        generator: A Generator to draw the random weights and biases from, or None if they are all given
+        activation: A function from Activations applied to each hidden neuron
+        output_activation: A function from Activations applied to each output neuron
     """
 
-    def __init__(self, num_inputs, num_outputs, num_hidden_layers, num_neurons_per_hidden_layer):
+    def __init__(self, num_inputs, num_outputs, num_hidden_layers, num_neurons_per_hidden_layer, generator,
+                 activation="sigmoid", output_activation="sigmoid"):
         """
         Initializes the NeuralNetwork
 
@@ -111,12 +131,21 @@ class NeuralNetwork(object):
             num_outputs: An integer count of the output neurons
             num_hidden_layers: An integer count of the hidden layers
             num_neurons_per_hidden_layer: An integer count of the neurons in a hidden layer
+            generator: A Generator to draw the random weights and biases from, which may be None if they are all given
+            activation: A string for the name in Activations.activations of the hidden neurons' activation
+            output_activation: A string for the name in Activations.bounded of the output neurons' activation
+
+        Raises:
+            ValueError: An activation is unknown or the output activation is not bounded
         """
         self.num_inputs = num_inputs
         self.num_outputs = num_outputs
         self.num_hidden_layers = num_hidden_layers
         self.num_neurons_per_hidden_layer = num_neurons_per_hidden_layer
         self.layers = []
+        self.generator = generator
+        self.activation = Activations.get_activation(activation)[0]
+        self.output_activation = Activations.get_activation(output_activation, output=True)[0]
 
     def create_network(self):
         """
@@ -126,14 +155,14 @@ class NeuralNetwork(object):
             TypeError: self.num_inputs, self.num_hidden_layers, self.num_neurons_per_hidden_layer, self.num_outputs
             cannot all be interpreted as an integer
         """
-        self.layers.append(NeuronLayer(self.num_inputs, 1))  # Create the input layer
+        self.layers.append(NeuronLayer(self.num_inputs, 1, self.generator))  # Create the input layer
 
         for i in range(0, self.num_hidden_layers):
-            self.layers.append(NeuronLayer(self.num_neurons_per_hidden_layer,
-                                           self.layers[i - 1].num_neurons))  # Create the hidden layers
+            self.layers.append(NeuronLayer(self.num_neurons_per_hidden_layer, self.layers[i - 1].num_neurons,
+                                           self.generator))  # Create the hidden layers
 
         self.layers.append(
-            NeuronLayer(self.num_outputs, self.num_neurons_per_hidden_layer))  # Create the output layer
+            NeuronLayer(self.num_outputs, self.num_neurons_per_hidden_layer, self.generator))  # Create the output layer
 
     def create_weights(self, *args):
         """
@@ -141,7 +170,7 @@ class NeuralNetwork(object):
         or base them on the weights from a parent.
 
         Args:
-            args: Either nothing or a list containing the list of weights from the parent
+            args: Either nothing or the list of weights from the parent followed by the mutation rate of the World
 
         Raises:
             TypeError: args[0] is not subscriptable
@@ -153,7 +182,7 @@ class NeuralNetwork(object):
                 if is_random:
                     neuron.create_weights()
                 else:
-                    neuron.set_weight(args[0][neurons_counted])
+                    neuron.set_weight(args[0][neurons_counted], args[1])
                     neurons_counted += 1
 
     def get_weights(self):
@@ -187,6 +216,9 @@ class NeuralNetwork(object):
         # Stores the resultant outputs from each layer
         outputs = []
 
+        # Copy the inputs so the caller's list is not replaced by the hidden layers' outputs
+        inputs = list(inputs)
+
         # Check that the correct amount of inputs are available
         if len(inputs) != self.num_inputs:
             print("Aborting network: Inconsistent inputs for input size")
@@ -203,6 +235,7 @@ class NeuralNetwork(object):
 
             outputs.clear()
             corr_weight = 0
+            activation = self.activation if i < self.num_hidden_layers else self.output_activation
 
             # For each neuron in the layer
             for j in self.layers[i + 1].neurons:
@@ -220,7 +253,7 @@ class NeuralNetwork(object):
                 net += j.bias
 
                 # Filter the output of the neuron then add it to the outputs
-                j.output = sigmoid(net)
+                j.output = activation(net)
 
                 outputs.append(j.output)
 
@@ -229,21 +262,142 @@ class NeuralNetwork(object):
         return outputs
 
 
-def sigmoid(t):
+class PackedNetwork(object):
+    """
+    A network compiled from a Genome once, when its Creature is born, for creatures updated one at a time. Each layer's
+    weights and biases are packed into one matrix with the biases as an extra column, so a layer is one matrix product
+    into an array allocated up front. Its outputs match NeuralNetwork's to within rounding
+
+    Attributes:
+        sizes: A tuple of the neuron count of each layer, starting with the input layer
+        inputs: An array of the inputs followed by a 1 that multiplies the biases
+        layers: A list with a tuple for each non-input layer of its packed matrix of shape (neurons, inputs + 1), the
+            array its outputs are written to, followed by a 1 for the next layer's biases, and its activation on arrays
+    """
+
+    def __init__(self, genome, activation="sigmoid", output_activation="sigmoid"):
+        """
+        Initializes the PackedNetwork
+
+        Args:
+            genome: The Genome of the network, which is copied so later changes to it are not seen
+            activation: A string for the name in Activations.activations of the hidden neurons' activation
+            output_activation: A string for the name in Activations.bounded of the output neurons' activation
+
+        Raises:
+            ValueError: An activation is unknown or the output activation is not bounded
+        """
+        self.sizes = genome.sizes
+        self.inputs = np.ones(self.sizes[0] + 1)
+        self.layers = []
+
+        functions = get_array_activations(len(genome.biases), activation, output_activation)
+        for weights, biases, function in zip(genome.weights, genome.biases, functions):
+            self.layers.append((np.column_stack((weights, biases)), np.ones(len(biases) + 1), function))
+
+    def calculate_network(self, inputs):
+        """
+        Calculate the output layer, the same as NeuralNetwork.calculate_network
+
+        Args:
+            inputs: A sequence of the inputs of the network
+
+        Returns:
+            A list of the outputs of the neurons of the output layer
+        """
+        outputs = self.inputs
+        outputs[:-1] = inputs
+
+        for matrix, layer_outputs, function in self.layers:
+            net = layer_outputs[:-1]
+            np.dot(matrix, outputs, out=net)
+            function(net, out=net)
+
+            outputs = layer_outputs
+
+        return outputs[:-1].tolist()
+
+
+def calculate_population(sizes, genomes, inputs, activation="sigmoid", output_activation="sigmoid"):
+    """
+    Calculate the output layer of the networks of a whole population at once with a few batched matrix
+    multiplications
+
+    Args:
+        sizes: A sequence of the neuron count of each layer shared by every network, starting with the input layer
+        genomes: An array of shape (population, genome size) where each row is the buffer of a Genome
+        inputs: An array of shape (population, inputs) where each row holds the inputs of the network in that row
+        activation: A string for the name in Activations.activations of the hidden neurons' activation
+        output_activation: A string for the name in Activations.bounded of the output neurons' activation
+
+    Returns:
+        An array of shape (population, outputs) where each row holds the outputs of the network in that row
+
+    Raises:
+        ValueError: inputs does not have one row of inputs for each network, an activation is unknown or the output
+            activation is not bounded
+    """
+    size = len(genomes)
+    outputs = np.asarray(inputs, dtype=float)
+
+    if outputs.shape != (size, sizes[0]):
+        raise ValueError("Expected inputs of shape (%d, %d) but got %s" % (size, sizes[0], str(outputs.shape)))
+
+    layout = Genome.layout(sizes)
+    functions = get_array_activations(len(layout), activation, output_activation)
+    for (weights_start, biases_start, num_neurons, num_inputs), function in zip(layout, functions):
+        weights = genomes[:, weights_start:biases_start].reshape(size, num_neurons, num_inputs)
+        biases = genomes[:, biases_start:biases_start + num_neurons]
+
+        net = np.matmul(weights, outputs[:, :, np.newaxis])[:, :, 0] + biases
+        outputs = function(net, out=net)
+
+    return outputs
+
+
+def from_genome(genome, activation="sigmoid", output_activation="sigmoid"):
+    """
+    Create a NeuralNetwork with the weights and biases of a Genome
+
+    Args:
+        genome: A Genome for a network with at least one hidden layer, all of the same size
+        activation: A string for the name in Activations.activations of the hidden neurons' activation
+        output_activation: A string for the name in Activations.bounded of the output neurons' activation
+
+    Returns:
+        A new NeuralNetwork
+
+    Raises:
+        ValueError: An activation is unknown or the output activation is not bounded
     """
-    The sigmoid transfer function
-              1
-    S(t) = -------
-            1+e^-t
+    network = NeuralNetwork(genome.sizes[0], genome.sizes[-1], len(genome.sizes) - 2, genome.sizes[1], None,
+                            activation=activation, output_activation=output_activation)
+
+    # The layers are filled straight from the Genome, so nothing random is drawn. The input layer only passes the
+    # inputs on, so its neurons have no weights and no bias
+    network.layers.append(NeuronLayer(genome.sizes[0], 1, None, biases=[0] * genome.sizes[0]))
+    for num_inputs, weights, biases in zip(genome.sizes, genome.weights, genome.biases):
+        network.layers.append(NeuronLayer(len(biases), num_inputs, None, weights.tolist(), biases.tolist()))
+
+    return network
+
+
+def get_array_activations(num_layers, activation, output_activation):
+    """
+    Get the activation on arrays of each non-input layer of a network
 
     Args:
-        t: An int for the t in S(t)
+        num_layers: An integer count of the non-input layers
+        activation: A string for the name in Activations.activations of the hidden neurons' activation
+        output_activation: A string for the name in Activations.bounded of the output neurons' activation
 
     Returns:
-        A float representing the output from the sigmoid function with t as the input.
-        If math.e ** -t causes an overflow error, then the output is rounded to 0.
+        A list of the function from Activations applied to each layer's array of weighted sums
+
+    Raises:
+        ValueError: An activation is unknown or the output activation is not bounded
     """
-    try:
-        return 1 / (1 + math.e ** -t)
-    except OverflowError:
-        return 0
+    hidden = Activations.get_activation(activation)[1]
+    output = Activations.get_activation(output_activation, output=True)[1]
+
+    return [hidden] * (num_layers - 1) + [output]
@@ -0,0 +1,278 @@
+import numpy as np
+
+import Genome
+import Utils
+
+
+class Population(object):
+    """
+    The state of every Creature stored as one array per attribute, so the whole population can be updated at once.
+    Rows are kept packed and in order of birth: row i of every array belongs to the same Creature
+
+    Attributes:
+        config: The WorldConfig of the World the creatures live in
+        random: The RandomStreams of the World the creatures live in
+        sizes: A tuple of the neuron count of each layer of every Creature's network, starting with the input layer
+        size: An integer count of the creatures stored
+        ids: An array of the number each Creature was given at birth
+        x: An array of the x positions
+        y: An array of the y positions
+        r: An array of the red values between 0 and 255
+        g: An array of the green values between 0 and 255
+        b: An array of the blue values between 0 and 255
+        food: An array of the food stored by each Creature
+        water: An array of the water stored by each Creature
+        direction_facing: An array of the directions faced
+        speed: An array of the percentages of the maximum speed between 0 and 1
+        action: An array of the current actions
+        radius: An array of the radii
+        left_eye_rad: An array of the angles in radians between the left eye and forward between 0 and pi/2
+        right_eye_rad: An array of the angles in radians between the right eye and forward between 0 and pi/2
+        birth_tick: An array of the tick each Creature was born on
+        cell: An array of the tile index each Creature is filed under in the World's SpatialGrid, or -1 once it has
+            died and been taken out of it
+        genomes: An array of shape (capacity, genome size) where each row is the buffer of a Creature's Genome
+    """
+
+    # The name of every array holding one value per Creature
+    columns = ("ids", "x", "y", "r", "g", "b", "food", "water", "direction_facing", "speed", "action", "radius",
+               "left_eye_rad", "right_eye_rad", "birth_tick", "cell", "genomes")
+
+    # The arrays holding whole numbers, every other array holds floats
+    integer_columns = ("ids", "r", "g", "b", "direction_facing", "action", "birth_tick", "cell")
+
+    def __init__(self, config, random, sizes, capacity=64):
+        """
+        Initializes the empty Population
+
+        Args:
+            config: The WorldConfig of the World the creatures live in
+            random: The RandomStreams of the World the creatures live in
+            sizes: A sequence of the neuron count of each layer of every Creature's network, starting with the input
+                layer
+            capacity: An integer count of the creatures to allocate room for, which grows as needed
+        """
+        self.config = config
+        self.random = random
+        self.sizes = tuple(sizes)
+        self.size = 0
+
+        for name in self.columns:
+            shape = (capacity, Genome.genome_size(self.sizes)) if name == "genomes" else (capacity,)
+            setattr(self, name, np.zeros(shape, dtype=np.int64 if name in self.integer_columns else float))
+
+    def add(self, ids, x, y, left_eye_rad, right_eye_rad, genomes, tick):
+        """
+        Add creatures to the end of the Population. Their colour, direction, speed and action are random and they
+        start with the config's birth_food food and birth_water water. Each Creature draws its random traits before the
+        next, so adding creatures at once draws the same numbers as adding them one at a time
+
+        Args:
+            ids: A sequence of the number given to each new Creature
+            x: A sequence of the x positions
+            y: A sequence of the y positions
+            left_eye_rad: A sequence of the left eye radians
+            right_eye_rad: A sequence of the right eye radians
+            genomes: An array of shape (creatures, genome size) of the Genome buffers
+            tick: An integer for the tick the creatures are born on
+
+        Returns:
+            A range of the rows of the new creatures
+        """
+        num = len(ids)
+        while self.size + num > len(self.ids):
+            for name in self.columns:
+                setattr(self, name, Utils.grow(getattr(self, name)))
+
+        rows = slice(self.size, self.size + num)
+        self.ids[rows] = ids
+        self.x[rows] = x
+        self.y[rows] = y
+        traits = self.random.traits.random((num, 6))
+        self.r[rows] = traits[:, 0] * 255
+        self.g[rows] = traits[:, 1] * 255
+        self.b[rows] = traits[:, 2] * 255
+        self.food[rows] = self.config.birth_food
+        self.water[rows] = self.config.birth_water
+        self.direction_facing[rows] = traits[:, 3] * 360
+        self.speed[rows] = traits[:, 4]
+        self.action[rows] = np.round(traits[:, 5])
+        self.radius[rows] = (self.food[rows] + self.water[rows]) / 30
+        self.left_eye_rad[rows] = left_eye_rad
+        self.right_eye_rad[rows] = right_eye_rad
+        self.birth_tick[rows] = tick
+        self.genomes[rows] = genomes
+
+        self.size += num
+
+        return range(rows.start, rows.stop)
+
+    def keep(self, alive):
+        """
+        Remove creatures, keeping the remaining rows packed and in order
+
+        Args:
+            alive: A boolean array with an element for each Creature that is False if it should be removed
+        """
+        num = int(np.count_nonzero(alive))
+
+        for name in self.columns:
+            column = getattr(self, name)
+            column[:num] = column[:self.size][alive]
+
+        self.size = num
+
+    def get_state(self):
+        """
+        Get the state of every Creature
+
+        Returns:
+            A dictionary mapping the name of each column to a view of its rows in use
+        """
+        return dict((name, getattr(self, name)[:self.size]) for name in self.columns)
+
+    def set_state(self, state):
+        """
+        Replace every Creature with the creatures of a state from get_state, copying the arrays
+
+        Args:
+            state: A dictionary from get_state
+        """
+        self.size = len(state["ids"])
+
+        for name in self.columns:
+            column = getattr(self, name)
+            setattr(self, name, np.array(state[name], dtype=column.dtype).reshape((self.size,) + column.shape[1:]))
+
+    def eye_positions(self, eye_rad, vision):
+        """
+        Calculate the coordinates of one eye's vision for every Creature
+
+        Args:
+            eye_rad: An array of the radians between the eye and forward for each Creature, such as left_eye_rad
+            vision: A number for how far past its body a Creature sees
+
+        Returns:
+            A tuple of arrays of the x and y coordinates
+        """
+        rows = slice(0, self.size)
+        center_x = self.x[rows] + self.radius[rows]
+        center_y = self.y[rows] + self.radius[rows]
+        angle = self.direction_facing[rows] - eye_rad[rows]
+        distance = self.radius[rows] + vision
+
+        return center_x + np.cos(angle) * distance, center_y + np.sin(angle) * distance
+
+    def sense(self, board, vision):
+        """
+        Look at every Creature and the tiles seen by its eyes
+
+        Args:
+            board: The Board the creatures are on
+            vision: A number for how far past its body a Creature sees
+
+        Returns:
+            An array of shape (size, 13) where each row holds the inputs for a Creature's network, in the same order
+            as Creature.sense
+        """
+        rows = slice(0, self.size)
+        left_tiles = self.config.get_tile_indices(*self.eye_positions(self.left_eye_rad, vision))
+        right_tiles = self.config.get_tile_indices(*self.eye_positions(self.right_eye_rad, vision))
+        board.sync(np.concatenate((left_tiles, right_tiles)))
+
+        inputs = np.empty((self.size, 13))
+        inputs[:, 0] = self.r[rows]
+        inputs[:, 1] = self.g[rows]
+        inputs[:, 2] = self.b[rows]
+        inputs[:, 3] = self.food[rows]
+        inputs[:, 4] = self.water[rows]
+        for column, field in ((5, board.temp), (6, board.food), (7, board.water)):
+            inputs[:, column] = field.reshape(-1)[left_tiles]
+            inputs[:, column + 3] = field.reshape(-1)[right_tiles]
+        inputs[:, 11] = self.left_eye_rad[rows]
+        inputs[:, 12] = self.right_eye_rad[rows]
+
+        return inputs
+
+    def apply_outputs(self, outputs):
+        """
+        Set the colour, direction, speed, action and eyes of every Creature from the outputs of its network
+
+        Args:
+            outputs: An array of shape (size, outputs) of the output of each Creature's network
+        """
+        # 0: Red, 1: Green, 2: Blue, 3: Direction Facing, 4: Speed, 5: Action (eat, drink, reproduce, fight, sleep),
+        # 6: Left eye radian, 7: Right eye radian
+        rows = slice(0, self.size)
+        self.r[rows] = outputs[:, 0] * 255
+        self.g[rows] = outputs[:, 1] * 255
+        self.b[rows] = outputs[:, 2] * 255
+        self.direction_facing[rows] = outputs[:, 3] * 360
+        self.speed[rows] = outputs[:, 4]
+        self.action[rows] = np.floor(6 * outputs[:, 5])
+        self.left_eye_rad[rows] = outputs[:, 6] * (np.pi / 2)
+        self.right_eye_rad[rows] = outputs[:, 7] * (np.pi / 2)
+
+    def fight(self, attackers, targets):
+        """
+        Have creatures fight, one fight at a time in the order given, with each attacker taking up to 30 of its
+        target's food
+
+        Args:
+            attackers: A sequence of the rows of the attacking creatures
+            targets: A sequence of the rows of the creatures each attacker fights
+        """
+        for attacker, target in zip(attackers, targets):
+            food_taken = max(0, min(self.food[target], 30))
+
+            self.food[attacker] += food_taken
+            self.food[target] -= food_taken
+
+    def reproduce(self, mutation_rate):
+        """
+        Have every Creature whose action is to reproduce and that has the resources reproduce
+
+        Args:
+            mutation_rate: A float for the chance of a mutation on a given weight or bias of a child's Genome
+
+        Returns:
+            A tuple of arrays for the x positions, y positions, left eye radians, right eye radians and Genome buffers
+            of the children, in order of their parents' rows, followed by an array of the parents' rows
+        """
+        parents = np.flatnonzero((self.action[:self.size] == 2) & (self.food[:self.size] >= self.config.birth_food) &
+                                 (self.water[:self.size] >= self.config.birth_water))
+
+        self.food[parents] -= self.config.birth_food
+        self.water[parents] -= self.config.birth_water
+
+        genomes = self.genomes[parents]
+        Genome.mutate(genomes, mutation_rate, self.random.mutation)
+
+        return (self.x[parents], self.y[parents], self.left_eye_rad[parents], self.right_eye_rad[parents],
+                genomes, parents)
+
+    def move(self, speed_coefficient):
+        """
+        Move every Creature forward and use up its resources
+
+        Args:
+            speed_coefficient: A number for the maximum speed
+        """
+        rows = slice(0, self.size)
+        distance = speed_coefficient * self.speed[rows]
+
+        self.x[rows] = (self.x[rows] + np.cos(self.direction_facing[rows]) * distance) % self.config.board_width
+        self.y[rows] = (self.y[rows] + np.sin(self.direction_facing[rows]) * distance) % self.config.board_height
+
+        # TODO: Improve resource consumption algorithm
+        self.food[rows] -= speed_coefficient / 4
+        self.water[rows] -= speed_coefficient / 4
+
+    def alive(self):
+        """
+        Find which creatures are still alive
+
+        Returns:
+            A boolean array with an element for each Creature that is False if it has run out of food or water
+        """
+        return (self.food[:self.size] > 0) & (self.water[:self.size] > 0)
@@ -0,0 +1,137 @@
+import collections
+import json
+import time
+
+
+class Profiler(object):
+    """
+    Times the phases of every tick of a World and counts what happens in it, over the whole run and over the last
+    window ticks. A phase lasts from when the previous phase was marked, or the tick began, until it is marked itself,
+    so the phases of a tick add up to the whole tick. Time and counts between ticks, such as drawing a frame, belong to
+    the next tick to end. A summary of the last window ticks can be appended to a file of JSON lines every interval
+    ticks, to be analysed after the run. A World without a Profiler checks for one at each phase and does nothing else
+
+    Attributes:
+        window: An integer count of the latest ticks the rolling timings and counts are taken over
+        path: A string for the path of the JSON lines file to append summaries to, or None to not write them
+        interval: An integer count of the ticks between summaries written to path
+        ticks: An integer count of the ticks that have ended
+        totals: A dictionary mapping the name of each phase to the total seconds spent in it
+        counts: A dictionary mapping the name of each counter to its total
+        current: A dictionary mapping the name of each phase to the seconds spent in it since the last tick ended
+        current_counts: A dictionary mapping the name of each counter to its count since the last tick ended
+        history: A deque of a tuple of current and current_counts for each of the last window ticks
+        last: A float for the time the tick began or the last phase was marked
+    """
+
+    def __init__(self, window=100, path=None, interval=1000):
+        """
+        Initializes the Profiler with no time spent in any phase
+
+        Args:
+            window: An integer count of the latest ticks to take the rolling timings and counts over
+            path: A string for the path of a JSON lines file to append summaries to, or None to not write them
+            interval: An integer count of the ticks between summaries written to path
+        """
+        self.window = window
+        self.path = path
+        self.interval = interval
+        self.ticks = 0
+        self.totals = {}
+        self.counts = {}
+        self.current = {}
+        self.current_counts = {}
+        self.history = collections.deque(maxlen=window)
+        self.last = time.perf_counter()
+
+    def begin(self):
+        """
+        Start timing the first phase of a tick, or of work between ticks
+        """
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """
+        End a phase, adding the time since the last phase or the start of the tick to it
+
+        Args:
+            phase: A string for the name of the phase
+        """
+        now = time.perf_counter()
+        self.totals[phase] = self.totals.get(phase, 0) + now - self.last
+        self.current[phase] = self.current.get(phase, 0) + now - self.last
+        self.last = now
+
+    def count(self, name, amount=1):
+        """
+        Add to a counter
+
+        Args:
+            name: A string for the name of the counter
+            amount: A number to add to it
+        """
+        self.counts[name] = self.counts.get(name, 0) + amount
+        self.current_counts[name] = self.current_counts.get(name, 0) + amount
+
+    def end(self, tick):
+        """
+        End a tick, moving its timings and counts into the rolling window and writing a summary if one is due
+
+        Args:
+            tick: An integer for the tick of the World after the tick that ended
+        """
+        self.history.append((self.current, self.current_counts))
+        self.current = {}
+        self.current_counts = {}
+        self.ticks += 1
+
+        if self.path is not None and self.ticks % self.interval == 0:
+            self.write_summary(tick)
+
+    def close(self, tick):
+        """
+        Write a last summary if summaries are written and ticks have ended since the last one
+
+        Args:
+            tick: An integer for the tick of the World when it stopped
+        """
+        if self.path is not None and self.ticks % self.interval != 0:
+            self.write_summary(tick)
+
+    def get_summary(self):
+        """
+        Summarise the last window ticks
+
+        Returns:
+            A dictionary mapping "ticks" to the count of ticks summarised, "phases" to a dictionary of the mean
+            milliseconds per tick spent in each phase and "counts" to a dictionary of the mean of each counter per
+            tick
+        """
+        ticks = max(1, len(self.history))
+        phases = {}
+        counts = {}
+
+        for timings, tick_counts in self.history:
+            for phase, seconds in timings.items():
+                phases[phase] = phases.get(phase, 0) + seconds * 1e3 / ticks
+            for name, amount in tick_counts.items():
+                counts[name] = counts.get(name, 0) + amount / ticks
+
+        return {"ticks": len(self.history), "phases": phases, "counts": counts}
+
+    def write_summary(self, tick):
+        """
+        Append a summary of the last window ticks to path as one line of JSON, along with the milliseconds spent in
+        each phase and the count of each counter over the whole run, so the time between any two lines can be found
+
+        Args:
+            tick: An integer for the tick of the World the summary is written on
+        """
+        summary = self.get_summary()
+        summary["tick"] = tick
+        summary["time"] = time.time()
+        summary["total_phases"] = dict((phase, seconds * 1e3) for phase, seconds in self.totals.items())
+        summary["total_counts"] = self.counts
+
+        with open(self.path, "a") as metrics_file:
+            metrics_file.write(json.dumps(summary) + "\n")
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class RandomStreams(object):
+    """
+    The random numbers of one World, split into an independent Generator for each part of the simulation. Every
+    stream is derived from one seed, so a World can be recreated exactly from its seed, and how many numbers one part
+    draws never changes the numbers drawn by another
+
+    Attributes:
+        seed: An integer for the seed the streams were derived from
+        terrain: A Generator for the noise the tiles are created from
+        placement: A Generator for the positions, eyes and Genomes of creatures without a parent
+        traits: A Generator for the colour, direction, speed and action of every new Creature
+        mutation: A Generator for mutating the Genomes of children
+    """
+
+    # The name of every stream, in the order they are derived from the seed. New streams must be added to the end so
+    # a seed keeps giving the same numbers
+    names = ("terrain", "placement", "traits", "mutation")
+
+    def __init__(self, seed=None):
+        """
+        Initializes the RandomStreams
+
+        Args:
+            seed: A non-negative integer to derive the streams from, or None for a random seed
+        """
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+
+        for name, child in zip(self.names, sequence.spawn(len(self.names))):
+            setattr(self, name, np.random.Generator(np.random.PCG64(child)))
+
+    def get_state(self):
+        """
+        Get the seed and the position of every stream
+
+        Returns:
+            A dictionary of plain Python values mapping "seed" to the seed and each name to its stream's state
+        """
+        state = dict((name, getattr(self, name).bit_generator.state) for name in self.names)
+        state["seed"] = self.seed
+
+        return state
+
+    def set_state(self, state):
+        """
+        Move every stream back to a state from get_state, so they draw the same numbers again
+
+        Args:
+            state: A dictionary from get_state
+        """
+        self.seed = state["seed"]
+
+        for name in self.names:
+            getattr(self, name).bit_generator.state = state[name]
@@ -0,0 +1,370 @@
+import ctypes
+import multiprocessing
+import time
+
+import numpy as np
+
+import World
+
+
+class Snapshot(object):
+    """
+    A copy of everything drawn of a World at one tick, which stays the same as the World changes
+
+    Attributes:
+        tick: An integer for the tick the Snapshot was taken on
+        board_tick: An integer for the tick the colour of a tile copied last changed on, or the tiles copied changed
+        population: An integer count of the creatures alive, which may be more than the Snapshot holds
+        coords: An array of shape (creatures, 12) with the coordinates of the oval, left eye line and right eye line
+            of each Creature, four each
+        colours: An array of the colour of each Creature packed into an integer as 0xRRGGBB
+        tile_rows: An array of the rows of the tiles copied, in increasing order
+        tile_columns: An array of the columns of the tiles copied, in increasing order
+        rgb: A 3D array of bytes indexed by [row, column, channel] of the colour of each tile in tile_rows and
+            tile_columns
+    """
+
+    def __init__(self, tick, board_tick, population, coords, colours, tile_rows, tile_columns, rgb):
+        """
+        Initializes the Snapshot
+
+        Args:
+            tick: An integer for the tick the Snapshot was taken on
+            board_tick: An integer for the tick the colour of a tile copied last changed on, or the tiles copied
+                changed
+            population: An integer count of the creatures alive
+            coords: An array of shape (creatures, 12) of the coordinates of each Creature's glyph
+            colours: An array of the packed colour of each Creature
+            tile_rows: An array of the rows of the tiles copied
+            tile_columns: An array of the columns of the tiles copied
+            rgb: A 3D array of bytes of the colour of each tile copied
+        """
+        self.tick = tick
+        self.board_tick = board_tick
+        self.population = population
+        self.coords = coords
+        self.colours = colours
+        self.tile_rows = tile_rows
+        self.tile_columns = tile_columns
+        self.rgb = rgb
+
+
+class SnapshotBuffer(object):
+    """
+    Two Snapshots in shared memory, so a process simulating a World can publish Snapshots while another process reads
+    the newest one without either waiting on a lock. The writer fills the slot that is not the newest then makes it
+    the newest. Each slot has a sequence number that is odd while the slot is being written, so a reader that was
+    overtaken by the writer notices and reads again. The reader asks for the tiles it shows, which the writer copies
+    into the following Snapshots, so only the tiles in view are synced and copied
+
+    Attributes:
+        tiles_per_row: An integer count of the rows and columns of tiles
+        max_creatures: An integer count of the most creatures a Snapshot can hold, further creatures are not drawn
+        latest: A shared integer for the slot holding the newest Snapshot, or -1 before the first is written
+        sequences: A shared array of the sequence number of each slot
+        ticks: A shared array of the tick, board tick and population of each slot
+        sizes: A shared array of the count of creatures, tile rows and tile columns in each slot
+        view_sizes: A shared array of the count of tile rows and tile columns asked for, both 0 for every tile
+        coords_memory: The shared memory of coords
+        colours_memory: The shared memory of colours
+        tiles_memory: The shared memory of tile_rows and tile_columns
+        view_memory: The shared memory of view_rows and view_columns
+        rgb_memory: The shared memory of rgb
+        coords: An array of shape (2, max_creatures, 12) in shared memory of the coordinates of each slot
+        colours: An array of shape (2, max_creatures) in shared memory of the colours of each slot
+        tile_rows: An array of shape (2, tiles_per_row) in shared memory of the tile rows of each slot
+        tile_columns: An array of shape (2, tiles_per_row) in shared memory of the tile columns of each slot
+        view_rows: An array in shared memory of the tile rows asked for
+        view_columns: An array in shared memory of the tile columns asked for
+        rgb: An array of shape (2, tiles_per_row * tiles_per_row * 3) in shared memory of the flattened tile colours
+            of each slot
+    """
+
+    def __init__(self, tiles_per_row, max_creatures=10000):
+        """
+        Initializes the SnapshotBuffer. It must be created before the processes sharing it are started
+
+        Args:
+            tiles_per_row: An integer count of the rows and columns of tiles
+            max_creatures: An integer count of the most creatures a Snapshot can hold
+        """
+        self.tiles_per_row = tiles_per_row
+        self.max_creatures = max_creatures
+        self.latest = multiprocessing.RawValue(ctypes.c_int64, -1)
+        self.sequences = multiprocessing.RawArray(ctypes.c_int64, 2)
+        self.ticks = multiprocessing.RawArray(ctypes.c_int64, 6)
+        self.sizes = multiprocessing.RawArray(ctypes.c_int64, 6)
+        self.view_sizes = multiprocessing.RawArray(ctypes.c_int64, 2)
+
+        self.coords_memory = multiprocessing.RawArray(ctypes.c_double, 2 * max_creatures * 12)
+        self.colours_memory = multiprocessing.RawArray(ctypes.c_int64, 2 * max_creatures)
+        self.tiles_memory = multiprocessing.RawArray(ctypes.c_int64, 4 * tiles_per_row)
+        self.view_memory = multiprocessing.RawArray(ctypes.c_int64, 2 * tiles_per_row)
+        self.rgb_memory = multiprocessing.RawArray(ctypes.c_uint8, 2 * tiles_per_row * tiles_per_row * 3)
+        self.view_shared_memory()
+
+    def __getstate__(self):
+        # The arrays view the shared memory, so only the memory is sent to a new process
+        state = dict(self.__dict__)
+        for name in ("coords", "colours", "tile_rows", "tile_columns", "view_rows", "view_columns", "rgb"):
+            del state[name]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.view_shared_memory()
+
+    def view_shared_memory(self):
+        """
+        Create the arrays viewing the shared memory
+        """
+        self.coords = np.frombuffer(self.coords_memory, dtype=np.float64).reshape(2, self.max_creatures, 12)
+        self.colours = np.frombuffer(self.colours_memory, dtype=np.int64).reshape(2, self.max_creatures)
+        tiles = np.frombuffer(self.tiles_memory, dtype=np.int64).reshape(2, 2, self.tiles_per_row)
+        self.tile_rows = tiles[0]
+        self.tile_columns = tiles[1]
+        self.view_rows, self.view_columns = np.frombuffer(self.view_memory, dtype=np.int64).reshape(2, -1)
+        self.rgb = np.frombuffer(self.rgb_memory, dtype=np.uint8).reshape(2, -1)
+
+    def request_view(self, rows, columns):
+        """
+        Ask the writer to copy a block of tiles into the following Snapshots. A writer reading the request while it
+        is changed may copy a mix of the old and new block, which the Snapshot after fixes
+
+        Args:
+            rows: An array of the rows of the block in increasing order
+            columns: An array of the columns of the block in increasing order
+        """
+        self.view_rows[:len(rows)] = rows
+        self.view_columns[:len(columns)] = columns
+        self.view_sizes[0] = len(rows)
+        self.view_sizes[1] = len(columns)
+
+    def get_view(self):
+        """
+        Get the block of tiles asked for by the reader
+
+        Returns:
+            A tuple of arrays of the rows and columns of the block, or of None for every tile if none was asked for
+        """
+        rows, columns = self.view_sizes[0], self.view_sizes[1]
+        if rows == 0 or columns == 0:
+            return None, None
+
+        return self.view_rows[:rows].copy(), self.view_columns[:columns].copy()
+
+    def write(self, snapshot):
+        """
+        Publish a Snapshot as the newest. Only one process may write
+
+        Args:
+            snapshot: The Snapshot to publish
+        """
+        slot = 1 - max(0, self.latest.value)
+        size = min(len(snapshot.colours), self.max_creatures)
+
+        self.sequences[slot] += 1
+        self.ticks[3 * slot] = snapshot.tick
+        self.ticks[3 * slot + 1] = snapshot.board_tick
+        self.ticks[3 * slot + 2] = snapshot.population
+        rows, columns = len(snapshot.tile_rows), len(snapshot.tile_columns)
+        self.sizes[3 * slot] = size
+        self.sizes[3 * slot + 1] = rows
+        self.sizes[3 * slot + 2] = columns
+        self.coords[slot, :size] = snapshot.coords[:size]
+        self.colours[slot, :size] = snapshot.colours[:size]
+        self.tile_rows[slot, :rows] = snapshot.tile_rows
+        self.tile_columns[slot, :columns] = snapshot.tile_columns
+        self.rgb[slot, :rows * columns * 3] = snapshot.rgb.reshape(-1)
+        self.sequences[slot] += 1
+
+        self.latest.value = slot
+
+    def read(self):
+        """
+        Copy the newest Snapshot
+
+        Returns:
+            The newest Snapshot, or None if none has been written yet or the writer kept overtaking the read
+        """
+        for attempt in range(10):
+            slot = self.latest.value
+            if slot < 0:
+                return None
+
+            sequence = self.sequences[slot]
+            if sequence % 2 == 1:
+                continue
+
+            size, rows, columns = self.sizes[3 * slot], self.sizes[3 * slot + 1], self.sizes[3 * slot + 2]
+            snapshot = Snapshot(self.ticks[3 * slot], self.ticks[3 * slot + 1], self.ticks[3 * slot + 2],
+                                self.coords[slot, :size].copy(), self.colours[slot, :size].copy(),
+                                self.tile_rows[slot, :rows].copy(), self.tile_columns[slot, :columns].copy(),
+                                self.rgb[slot, :rows * columns * 3].reshape(rows, columns, 3).copy())
+
+            if self.sequences[slot] == sequence:
+                return snapshot
+
+        return None
+
+
+def take_snapshot(world, previous=None, tile_rows=None, tile_columns=None):
+    """
+    Take a Snapshot of a World, copying only a block of its tiles, such as those in view. The tiles are read as of
+    the current tick without syncing the rest of the board, so the cost of a Snapshot follows the size of the block
+    instead of the board. When profiled, the tiles in the block whose colour changed are counted as dirty tiles
+
+    Args:
+        world: The World to take a Snapshot of
+        previous: The last Snapshot taken of the World, or None if this is the first
+        tile_rows: An array of the rows of the tiles to copy in increasing order, or None for every tile
+        tile_columns: An array of the columns of the tiles to copy in increasing order, or None for every tile
+
+    Returns:
+        A new Snapshot
+    """
+    if tile_rows is None or tile_columns is None:
+        tile_rows = tile_columns = np.arange(world.config.tiles_per_row)
+        rgb = world.board.get_rgb()
+    else:
+        rgb = world.board.get_rgb(tile_rows, tile_columns)
+
+    same_tiles = (previous is not None and np.array_equal(tile_rows, previous.tile_rows) and
+                  np.array_equal(tile_columns, previous.tile_columns))
+    changed = not same_tiles or not np.array_equal(rgb, previous.rgb)
+
+    if world.profiler is not None:
+        world.count("dirty_tiles", np.count_nonzero((rgb != previous.rgb).any(axis=2)) if same_tiles else rgb.size // 3)
+
+    board_tick = world.tick if changed else previous.board_tick
+    if not changed:
+        rgb = previous.rgb
+
+    population = world.population
+    rows = slice(0, population.size)
+    x = population.x[rows]
+    y = population.y[rows]
+    diameter = population.radius[rows] * 2
+    center_x = x + diameter / 2
+    center_y = y + diameter / 2
+    left_x, left_y = population.eye_positions(population.left_eye_rad, world.config.vision)
+    right_x, right_y = population.eye_positions(population.right_eye_rad, world.config.vision)
+
+    coords = np.column_stack((x, y, x + diameter, y + diameter, center_x, center_y, left_x, left_y,
+                              center_x, center_y, right_x, right_y))
+    colours = (population.r[rows] << 16) | (population.g[rows] << 8) | population.b[rows]
+
+    return Snapshot(world.tick, board_tick, population.size, coords, colours, tile_rows, tile_columns, rgb)
+
+
+def get_pixel_tiles(length, start, scale, tile_width, tiles_per_row, outline):
+    """
+    Find the tile under each pixel along one side of a Viewport
+
+    Args:
+        length: An integer count of the pixels along the side
+        start: A float for the coordinate of the board at the first pixel
+        scale: A float for the pixels per unit of the board
+        tile_width: A float for the width of a tile
+        tiles_per_row: An integer count of the tiles along the side
+        outline: A boolean for whether the first pixel of every tile is black, outlining it
+
+    Returns:
+        An array with the row or column of the tile under each pixel, or -1 for pixels off the board or outlining a
+        tile
+    """
+    tiles = np.floor((start + np.arange(length) / scale) / tile_width).astype(int)
+
+    if outline:
+        first = np.ones(length, dtype=bool)
+        first[1:] = tiles[1:] != tiles[:-1]
+        tiles[first] = -1
+
+    tiles[(tiles < 0) | (tiles >= tiles_per_row)] = -1
+
+    return tiles
+
+
+def get_ppm(rgb, pixel_rows, pixel_columns):
+    """
+    Scale the colours of the tiles up to an image in the binary PPM format read by PhotoImage
+
+    Args:
+        rgb: A 3D array of bytes indexed by [row, column, channel] of the colour of each tile
+        pixel_rows: An array of the row of the tile under each row of pixels, or -1 for black
+        pixel_columns: An array of the column of the tile under each column of pixels, or -1 for black
+
+    Returns:
+        The bytes of the image
+    """
+    pixels = rgb[np.maximum(pixel_rows, 0)[:, np.newaxis], np.maximum(pixel_columns, 0)]
+    pixels[(pixel_rows < 0)[:, np.newaxis] | (pixel_columns < 0)] = 0
+
+    return b"P6 %d %d 255\n" % (len(pixel_columns), len(pixel_rows)) + pixels.tobytes()
+
+
+def run_simulation(buffer, config, ticks_per_second, fps, stop, events=None, checkpointer=None, profiler=None):
+    """
+    Simulate a World, publishing a Snapshot to a SnapshotBuffer at most fps times a second, until stopped. Runs in its
+    own process
+
+    Args:
+        buffer: The SnapshotBuffer to publish to
+        config: The WorldConfig of the World to simulate
+        ticks_per_second: A shared float for the rate to simulate the World at, or 0 for as fast as possible, which
+            can be changed while running
+        fps: A number for the most Snapshots to publish per second
+        stop: An Event that stops the simulation when set
+        events: An EventLog to record what happens in the World, which is closed when stopped, or None
+        checkpointer: A Checkpointer to resume the World from and save it with, including when stopped, or None
+        profiler: A Profiler to time the World with, which writes a last summary when stopped, or None
+    """
+    if checkpointer is None:
+        world = World.World(config, events=events)
+    else:
+        world = checkpointer.create_world(config, events=events)
+
+    world.profiler = profiler
+
+    snapshot = take_snapshot(world, None, *buffer.get_view())
+    buffer.write(snapshot)
+    published = time.perf_counter()
+
+    accumulator = 0
+    last_time = time.perf_counter()
+    while not stop.is_set():
+        now = time.perf_counter()
+        rate = ticks_per_second.value
+
+        if rate <= 0:
+            world.step()
+        else:
+            # The same fixed timestep as GUI.App, skipping ticks when more than a quarter second of them are due
+            accumulator = min(accumulator + (now - last_time) * rate, max(1, .25 * rate))
+            ticks = int(accumulator)
+            accumulator -= ticks
+
+            if ticks > 0:
+                world.step(ticks)
+            else:
+                time.sleep((1 - accumulator) / rate)
+
+        last_time = now
+
+        if checkpointer is not None:
+            checkpointer.update(world)
+
+        if world.tick != snapshot.tick and time.perf_counter() - published >= 1 / fps:
+            snapshot = take_snapshot(world, snapshot, *buffer.get_view())
+            buffer.write(snapshot)
+            published = time.perf_counter()
+
+    if checkpointer is not None:
+        checkpointer.save(world)
+
+    if events is not None:
+        events.close()
+
+    if profiler is not None:
+        profiler.close(world.tick)
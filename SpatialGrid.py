@@ -0,0 +1,325 @@
+import math
+
+import numpy as np
+
+
+class SpatialGrid(object):
+    """
+    A uniform grid over the tiles of the board. Every Creature is filed under the tile containing its center, in the
+    cell array of the Population, so the creatures near a point are found by only checking the cells around it. The
+    rows sorted by cell are kept sorted as single creatures are born and move, by moving only their own row, and are
+    sorted again when many creatures change at once. The board wraps around, so queries do too
+
+    Attributes:
+        config: The WorldConfig of the World the grid belongs to
+        population: The Population storing the positions and cells of the creatures
+        order: An array of the rows of the Population sorted by cell then row, or None if many creatures changed since
+            it was sorted
+        sorted_cells: An array of the cell of each row in order
+    """
+
+    def __init__(self, config, population):
+        """
+        Initializes the SpatialGrid
+
+        Args:
+            config: The WorldConfig of the World the grid belongs to
+            population: The Population storing the positions of the creatures
+        """
+        self.config = config
+        self.population = population
+        self.order = None
+        self.sorted_cells = None
+
+    def insert(self, rows):
+        """
+        File newly added creatures under their cell
+
+        Args:
+            rows: A sequence of the rows of the new creatures, which come after the row of every Creature filed
+        """
+        rows = np.asarray(rows, dtype=int)
+        cells = self.get_cells(*self.get_centers(rows))
+        self.population.cell[rows] = cells
+
+        if self.order is not None:
+            # Every new row comes after the filed rows, so it goes after the last row filed under the same cell
+            order = np.lexsort((rows, cells))
+            positions = np.searchsorted(self.sorted_cells, cells[order], side="right")
+            self.order = np.insert(self.order, positions, rows[order])
+            self.sorted_cells = np.insert(self.sorted_cells, positions, cells[order])
+
+    def remove(self, alive=None):
+        """
+        Renumber the sorted rows after creatures were removed from the Population
+
+        Args:
+            alive: The boolean array the Population kept its creatures with, or None to sort the rows again
+        """
+        if alive is None or self.order is None:
+            self.order = None
+
+            return
+
+        # Keeping rows in order renumbers them without changing their order, so the sorted rows stay sorted
+        kept = alive[self.order]
+        self.order = (np.cumsum(alive) - 1)[self.order[kept]]
+        self.sorted_cells = self.sorted_cells[kept]
+
+    def remove_creature(self, row):
+        """
+        Take a Creature that died out of the grid while its row is still in the Population, so no query finds it
+
+        Args:
+            row: An integer for the row of the Creature
+        """
+        if self.order is not None:
+            position = self.get_position(row, self.population.cell[row])
+            self.order = np.delete(self.order, position)
+            self.sorted_cells = np.delete(self.sorted_cells, position)
+
+        self.population.cell[row] = -1
+
+    def update(self):
+        """
+        Refile every Creature whose center has moved to a different tile
+        """
+        rows = slice(0, self.population.size)
+        cells = self.get_cells(*self.get_centers(rows))
+
+        if not np.array_equal(cells, self.population.cell[rows]):
+            self.population.cell[rows] = cells
+            self.order = None
+
+    def update_creature(self, row):
+        """
+        Refile one Creature if its center has moved to a different tile
+
+        Args:
+            row: An integer for the row of the Creature that moved
+        """
+        cell = self.get_cells(*self.get_centers(row))
+
+        if cell != self.population.cell[row]:
+            if self.order is not None:
+                self.move_row(row, cell)
+
+            self.population.cell[row] = cell
+
+    def move_row(self, row, cell):
+        """
+        Move a row from its place in the sorted rows to its place under a new cell, shifting only the rows between
+
+        Args:
+            row: An integer for the row of the Creature
+            cell: An integer for the cell it is filed under now
+        """
+        old = self.get_position(row, self.population.cell[row])
+        new = self.get_position(row, cell)
+
+        if new > old:
+            # The rows between shift back into the place left by the row
+            new -= 1
+            self.order[old:new] = self.order[old + 1:new + 1]
+            self.sorted_cells[old:new] = self.sorted_cells[old + 1:new + 1]
+        else:
+            self.order[new + 1:old + 1] = self.order[new:old]
+            self.sorted_cells[new + 1:old + 1] = self.sorted_cells[new:old]
+
+        self.order[new] = row
+        self.sorted_cells[new] = cell
+
+    def get_position(self, row, cell):
+        """
+        Find where a row is, or would be, among the sorted rows filed under a cell
+
+        Args:
+            row: An integer for the row of a Creature
+            cell: An integer for the cell
+
+        Returns:
+            An integer for the position of the row in order
+        """
+        start = np.searchsorted(self.sorted_cells, cell, side="left")
+        end = np.searchsorted(self.sorted_cells, cell, side="right")
+
+        return int(start + np.searchsorted(self.order[start:end], row))
+
+    def sort(self):
+        """
+        Sort the rows by cell if they are not sorted, leaving out creatures taken out of the grid
+        """
+        if self.order is None:
+            order = np.argsort(self.population.cell[:self.population.size], kind="stable")
+            self.order = order[self.population.cell[order] >= 0]
+            self.sorted_cells = self.population.cell[self.order]
+
+    def get_centers(self, rows):
+        """
+        Get the centers of creatures, wrapped onto the board since a Creature near the right or bottom edge can have
+        its center past it
+
+        Args:
+            rows: An integer, slice or array of the rows of the creatures
+
+        Returns:
+            A tuple of the x and y coordinates
+        """
+        return ((self.population.x[rows] + self.population.radius[rows]) % self.config.board_width,
+                (self.population.y[rows] + self.population.radius[rows]) % self.config.board_height)
+
+    def get_cells(self, x, y):
+        """
+        Get the cells containing positions, wrapping around the board the same way find does
+
+        Args:
+            x: A float or array of the x coordinates
+            y: A float or array of the y coordinates
+
+        Returns:
+            An integer or array of the cell of each position
+        """
+        tiles_per_row = self.config.tiles_per_row
+        rows = np.floor(np.asarray(y) / self.config.tile_width).astype(int) % tiles_per_row
+        columns = np.floor(np.asarray(x) / self.config.tile_width).astype(int) % tiles_per_row
+
+        return rows * tiles_per_row + columns
+
+    def find(self, x, y, radius):
+        """
+        Find the creatures whose center is within a distance of each of several points at once
+
+        Args:
+            x: A float or array of the x coordinates of the points
+            y: A float or array of the y coordinates of the points
+            radius: A float or array of the distance from each point
+
+        Returns:
+            A tuple of arrays with an element for each Creature found near each point: the index of the point, the
+            row of the Creature, the x and y distances from the point to its center across the wrapping board, and
+            the distance between them
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), x.shape)
+
+        self.sort()
+
+        # The cells within reach of every point, without visiting a cell twice when the reach wraps the whole board
+        tile_width = self.config.tile_width
+        tiles_per_row = self.config.tiles_per_row
+        reach = int(math.ceil(radius.max() / tile_width)) if len(x) > 0 else 0
+        if 2 * reach + 1 < tiles_per_row:
+            offsets = np.arange(-reach, reach + 1)
+        else:
+            offsets = np.arange(tiles_per_row)
+
+        rows = (np.floor(y / tile_width).astype(int)[:, np.newaxis] + offsets) % tiles_per_row
+        columns = (np.floor(x / tile_width).astype(int)[:, np.newaxis] + offsets) % tiles_per_row
+        cells = (rows[:, :, np.newaxis] * tiles_per_row + columns[:, np.newaxis, :]).reshape(len(x), -1)
+
+        # Every Creature in those cells is a candidate
+        starts = np.searchsorted(self.sorted_cells, cells, side="left").ravel()
+        counts = np.searchsorted(self.sorted_cells, cells, side="right").ravel() - starts
+        ends = np.cumsum(counts)
+        positions = np.arange(ends[-1] if len(ends) > 0 else 0) + np.repeat(starts - ends + counts, counts)
+        points = np.repeat(np.arange(cells.size) // cells.shape[1], counts)
+        found = self.order[positions]
+
+        center_x, center_y = self.get_centers(found)
+        width, height = self.config.board_width, self.config.board_height
+        dx = (center_x - x[points] + width / 2) % width - width / 2
+        dy = (center_y - y[points] + height / 2) % height - height / 2
+        distance = np.hypot(dx, dy)
+
+        near = distance <= radius[points]
+
+        return points[near], found[near], dx[near], dy[near], distance[near]
+
+    def find_in_cones(self, x, y, radius, direction, half_angle):
+        """
+        Find the creatures whose center is within a distance of each of several points and within an angle of a
+        direction from it, such as the creatures an eye can see
+
+        Args:
+            x: A float or array of the x coordinates of the points
+            y: A float or array of the y coordinates of the points
+            radius: A float or array of the distance from each point
+            direction: A float or array of the direction of the middle of each cone in radians
+            half_angle: A float for the most radians a Creature can be from the direction
+
+        Returns:
+            A tuple of arrays with an element for each Creature found in each cone: the index of the point, the row
+            of the Creature and the distance between them
+        """
+        points, found, dx, dy, distance = self.find(x, y, radius)
+        direction = np.broadcast_to(np.asarray(direction, dtype=float), np.shape(np.atleast_1d(x)))
+        angle = np.abs((np.arctan2(dy, dx) - direction[points] + math.pi) % (2 * math.pi) - math.pi)
+
+        in_cone = angle <= half_angle
+
+        return points[in_cone], found[in_cone], distance[in_cone]
+
+    def query_radius(self, x, y, radius):
+        """
+        Find the creatures whose center is within a distance of a point
+
+        Args:
+            x: A float for the x coordinate of the point
+            y: A float for the y coordinate of the point
+            radius: A float for the distance
+
+        Returns:
+            An array of the rows of the creatures found, closest first
+        """
+        points, found, dx, dy, distance = self.find(x, y, radius)
+
+        return found[np.argsort(distance, kind="stable")]
+
+    def query_cone(self, x, y, radius, direction, half_angle):
+        """
+        Find the creatures whose center is within a distance of a point and within an angle of a direction from it
+
+        Args:
+            x: A float for the x coordinate of the point
+            y: A float for the y coordinate of the point
+            radius: A float for the distance
+            direction: A float for the direction of the middle of the cone in radians
+            half_angle: A float for the most radians a Creature can be from direction
+
+        Returns:
+            An array of the rows of the creatures found, closest first
+        """
+        points, found, distance = self.find_in_cones(x, y, radius, direction, half_angle)
+
+        return found[np.argsort(distance, kind="stable")]
+
+    def nearest_in_cones(self, rows, radius, direction, half_angle):
+        """
+        Find the closest other Creature in a cone in front of each of several creatures
+
+        Args:
+            rows: An array of the rows of the creatures looking
+            radius: A float or array of how far each Creature can see from its center
+            direction: An array of the direction each Creature is looking in radians
+            half_angle: A float for the most radians a Creature can be from the direction
+
+        Returns:
+            An array with the row of the closest Creature seen by each Creature, or -1 if it sees none
+        """
+        points, found, distance = self.find_in_cones(*self.get_centers(rows), radius=radius, direction=direction,
+                                                     half_angle=half_angle)
+
+        other = found != rows[points]
+        points, found, distance = points[other], found[other], distance[other]
+
+        # Sort by point then distance so the first Creature found for each point is the closest
+        order = np.lexsort((distance, points))
+        points, found = points[order], found[order]
+        first = np.ones(len(points), dtype=bool)
+        first[1:] = points[1:] != points[:-1]
+
+        nearest = np.full(len(rows), -1, dtype=int)
+        nearest[points[first]] = found[first]
+
+        return nearest
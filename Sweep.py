@@ -0,0 +1,87 @@
+import itertools
+import json
+import multiprocessing
+
+import Config
+import World
+
+
+def run_sweep(grid, seeds, ticks, output_path, sample_interval=100, processes=None, config=None):
+    """
+    Run a headless World for every combination of settings and seeds in a pool of worker processes. The metrics of
+    each run are appended to the results file as one line of JSON as soon as it finishes. A run whose population goes
+    extinct stops early so its worker can start the next run
+
+    Args:
+        grid: A dictionary mapping the name of each setting of a WorldConfig, other than seed, to a list of values to
+            try
+        seeds: A list of integers to seed each combination of settings with
+        ticks: An integer count of the ticks to simulate in each run
+        output_path: A string for the path of the JSON lines file to append the results to
+        sample_interval: An integer count of the ticks between samples of the population
+        processes: An integer count of the worker processes, or None for one per core
+        config: The WorldConfig whose settings are used for the settings not in grid, or None for the default settings
+
+    Raises:
+        ValueError: A setting in grid is not a setting of a WorldConfig, or is seed
+    """
+    settings = [name for name, value in Config.WorldConfig.defaults if name != "seed"]
+    for name in grid:
+        if name not in settings:
+            raise ValueError("Unknown setting %s" % name)
+
+    base_settings = {} if config is None else config.get_settings()
+    names = sorted(grid)
+    runs = [(dict(zip(names, values)), seed, ticks, sample_interval, base_settings)
+            for values in itertools.product(*(grid[name] for name in names)) for seed in seeds]
+
+    pool = multiprocessing.Pool(processes)
+    with open(output_path, "a") as output:
+        for i, result in enumerate(pool.imap_unordered(run_configuration, runs)):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+            print("Finished run %d of %d: %s seed %d" % (i + 1, len(runs), result["settings"], result["seed"]))
+
+    pool.close()
+    pool.join()
+
+
+def run_configuration(run):
+    """
+    Simulate one combination of settings and seed. Runs in a worker process
+
+    Args:
+        run: A tuple of the dictionary of settings, the integer seed, the integer count of ticks, the integer count
+            of ticks between samples and the dictionary of settings used for those not in the first
+
+    Returns:
+        A dictionary of the settings, seed, population and mean age sampled every sample_interval ticks, and the
+        tick the population went extinct on or None if it survived
+    """
+    settings, seed, ticks, sample_interval, base_settings = run
+
+    world_settings = dict(base_settings, **settings)
+    world_settings["seed"] = seed
+
+    world = World.World(Config.WorldConfig(**world_settings))
+    population = world.population
+    samples = []
+    extinction_tick = None
+
+    while world.tick < ticks:
+        world.step()
+
+        if world.tick % sample_interval == 0 or population.size == 0:
+            ages = world.tick - population.birth_tick[:population.size]
+
+            samples.append({"tick": world.tick,
+                            "population": population.size,
+                            "mean_age": float(ages.mean()) if population.size > 0 else None})
+
+        if population.size == 0:
+            extinction_tick = world.tick
+
+            break
+
+    return {"settings": settings, "seed": seed, "samples": samples, "extinction_tick": extinction_tick}
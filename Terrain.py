@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+import Test
+
+# The version of how terrain is generated, part of every cache key so changing the noise never loads stale terrain
+version = 1
+
+# Test.p as an array, so a whole grid of hashes is looked up at once
+permutations = np.array(Test.p)
+
+
+def grad_array(hash, x, y, z):
+    """
+    The same as Test.grad for arrays of hashes and distances
+
+    Args:
+        hash: An array of the hashes of the corners
+        x: An array of the x distances from the corners
+        y: An array of the y distances from the corners
+        z: An array of the z distances from the corners
+
+    Returns:
+        An array of the dot product of each corner's gradient and distance
+    """
+    h = hash & 15
+    u = np.where(h < 8, x, y)
+    v = np.where(h < 4, y, np.where((h == 12) | (h == 14), x, z))
+
+    return np.where((h & 1) == 0, u, -u) + np.where((h & 2) == 0, v, -v)
+
+
+def perlin_array(x, y, z):
+    """
+    The same as Test.perlin for arrays of non-negative coordinates, giving exactly the same values
+
+    Args:
+        x: An array of the x coordinates
+        y: An array of the y coordinates, broadcast against x
+        z: An array of the z coordinates, broadcast against x and y
+
+    Returns:
+        An array of the noise between 0 and 1 at each point
+    """
+    x, y, z = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(z, dtype=float))
+    p = permutations
+
+    xi = x.astype(int) & 255
+    yi = y.astype(int) & 255
+    zi = z.astype(int) & 255
+
+    xf = x - x.astype(int)
+    yf = y - y.astype(int)
+    zf = z - z.astype(int)
+
+    u = Test.fade(xf)
+    v = Test.fade(yf)
+    w = Test.fade(zf)
+
+    aaa = p[p[p[xi] + yi] + zi]
+    aba = p[p[p[xi] + yi + 1] + zi]
+    aab = p[p[p[xi] + yi] + zi + 1]
+    abb = p[p[p[xi] + yi + 1] + zi + 1]
+    baa = p[p[p[xi + 1] + yi] + zi]
+    bba = p[p[p[xi + 1] + yi + 1] + zi]
+    bab = p[p[p[xi + 1] + yi] + zi + 1]
+    bbb = p[p[p[xi + 1] + yi + 1] + zi + 1]
+
+    x1 = Test.lerp(grad_array(aaa, xf, yf, zf), grad_array(baa, xf - 1, yf, zf), u)
+    x2 = Test.lerp(grad_array(aba, xf, yf - 1, zf), grad_array(bba, xf - 1, yf - 1, zf), u)
+    y1 = Test.lerp(x1, x2, v)
+    x1 = Test.lerp(grad_array(aab, xf, yf, zf - 1), grad_array(bab, xf - 1, yf, zf - 1), u)
+    x2 = Test.lerp(grad_array(abb, xf, yf - 1, zf - 1), grad_array(bbb, xf - 1, yf - 1, zf - 1), u)
+    y2 = Test.lerp(x1, x2, v)
+
+    return (Test.lerp(y1, y2, w) + 1) / 2
+
+
+def octave_perlin_array(x, y, z, octaves=1, persistence=.5):
+    """
+    Add layers of perlin noise, each at twice the frequency of the last, for finer detail. One octave is the same as
+    perlin_array
+
+    Args:
+        x: An array of the x coordinates
+        y: An array of the y coordinates, broadcast against x
+        z: An array of the z coordinates, broadcast against x and y
+        octaves: An integer count of the layers of noise
+        persistence: A float to multiply the amplitude of each layer by for the next
+
+    Returns:
+        An array of the noise between 0 and 1 at each point
+    """
+    total = 0
+    frequency = 1
+    amplitude = 1
+    max_value = 0
+
+    for i in range(octaves):
+        total = total + perlin_array(x * frequency, y * frequency, z * frequency) * amplitude
+        max_value += amplitude
+        amplitude *= persistence
+        frequency *= 2
+
+    return total / max_value
+
+
+def create_terrain(tiles_per_row, offsets, octaves=1):
+    """
+    Create layers of noise over the tiles, one per offset, the same as sampling Test.perlin at every tile
+
+    Args:
+        tiles_per_row: An integer count of the rows and columns of tiles
+        offsets: A sequence of the z coordinate of each layer in the noise, between 0 and 1
+        octaves: An integer count of the octaves of noise
+
+    Returns:
+        A 3D array of bytes indexed by [layer, row, column] of the noise at each tile times 255
+    """
+    coords = np.arange(tiles_per_row) / tiles_per_row
+    x = coords[np.newaxis, :]
+    y = coords[:, np.newaxis]
+
+    return np.stack([(octave_perlin_array(x, y, offset, octaves) * 255).astype(np.uint8) for offset in offsets])
+
+
+def get_terrain(tiles_per_row, offsets, octaves=1, cache=None):
+    """
+    Get layers of noise over the tiles as create_terrain does, reading them from a cache directory when they were
+    created before. The cache is keyed on a hash of everything the terrain depends on, and new terrain is written
+    next to its file then moved into place so processes sharing a cache never read a partly written file
+
+    Args:
+        tiles_per_row: An integer count of the rows and columns of tiles
+        offsets: A sequence of the z coordinate of each layer in the noise, between 0 and 1
+        octaves: An integer count of the octaves of noise
+        cache: A string for the directory to cache terrain in, which is created if needed, or None to not cache
+
+    Returns:
+        A 3D array of bytes indexed by [layer, row, column], memory mapped read only when cached
+    """
+    if cache is None:
+        return create_terrain(tiles_per_row, offsets, octaves)
+
+    # repr keeps every digit of the offsets, so different offsets never share a key
+    key = json.dumps([version, tiles_per_row, [repr(float(offset)) for offset in offsets], octaves])
+    path = os.path.join(cache, "%s.npy" % hashlib.sha256(key.encode()).hexdigest())
+
+    if not os.path.exists(path):
+        os.makedirs(cache, exist_ok=True)
+
+        temporary_path = "%s.%d.tmp" % (path, os.getpid())
+        with open(temporary_path, "wb") as terrain_file:
+            np.save(terrain_file, create_terrain(tiles_per_row, offsets, octaves))
+
+        os.replace(temporary_path, path)
+
+    return np.load(path, mmap_mode="r")
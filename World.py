@@ -0,0 +1,379 @@
+import numpy as np
+
+import Board
+import Config
+import Creature
+import Events
+import Genome
+import NeuralNetwork
+import Population
+import RandomStreams
+import SpatialGrid
+
+
+class World(object):
+    """
+    The simulation engine. It owns the tiles and creatures and has no knowledge of how, or if, it is drawn
+
+    Attributes:
+        config: The WorldConfig holding the settings of the World
+        random: The RandomStreams every random number of the World is drawn from, derived from config.seed
+        batched: A boolean for whether the whole population is updated at once each tick instead of one Creature at a
+            time
+        compiled: A boolean for whether, when not batched, each Creature's Genome is compiled into a PackedNetwork when
+            it is born instead of being interpreted by a NeuralNetwork
+        staged: A boolean for whether, when not batched, the creatures are updated one at a time but in the same order
+            of steps as a batched World, so the World steps exactly as a batched World does
+        tick: An integer count of the ticks that have been simulated
+        board: A Board storing the tiles
+        population: A Population storing the state of every Creature alive
+        creatures: A list of the Creature handles in the same order as the rows of the Population
+        grid: A SpatialGrid of the creatures for finding the creatures near a point
+        dying: A list of the rows of the creatures that died during a tick updating one Creature at a time, which are
+            removed from the Population at once when the tick ends
+        total_creature_num: An integer for the total amount of creatures that have been created
+        events: An EventLog recording what happens, or None to record nothing
+        profiler: A Profiler timing the phases of every tick and counting births and deaths, or None to time nothing
+    """
+
+    def __init__(self, config=None, batched=True, events=None, state=None, compiled=False,
+                 profiler=None, staged=False):
+        """
+        Initializes the World by creating the tiles and the initial creatures, or by restoring them from a state
+
+        Args:
+            config: The WorldConfig holding the settings of the World, or None for the default settings
+            batched: A boolean for whether the whole population is updated at once each tick instead of one Creature
+                at a time
+            events: An EventLog to record what happens, or None to record nothing
+            state: A dictionary from get_state of a World with the same settings to resume from, or None to create a
+                new World
+            compiled: A boolean for whether, when not batched, each Creature's Genome is compiled into a PackedNetwork
+                when it is born, which is faster but only matches interpreting it to within rounding
+            profiler: A Profiler to time the phases of every tick and count births and deaths, or None to time nothing
+            staged: A boolean for whether, when not batched, the creatures are updated one at a time but in the same
+                order of steps as a batched World, to check a batched World against
+        """
+        self.config = Config.WorldConfig() if config is None else config
+        self.random = RandomStreams.RandomStreams(self.config.seed)
+        self.batched = batched
+        self.compiled = compiled
+        self.staged = staged
+        self.tick = 0
+        self.population = Population.Population(self.config, self.random, Creature.genome_sizes)
+        self.creatures = []
+        self.grid = SpatialGrid.SpatialGrid(self.config, self.population)
+        self.dying = []
+        self.total_creature_num = 0
+        self.events = events
+        self.profiler = None
+
+        if state is not None:
+            self.board = Board.Board(self.config, state["board"]["temp"], state["board"]["food"],
+                                     state["board"]["water"])
+            self.set_state(state)
+            self.profiler = profiler
+
+            return
+
+        self.board = Board.create_board(self.config, self.random.terrain)
+
+        num = self.config.init_creature_num
+        placement = self.random.placement
+        self.add_creatures((placement.random(num) * self.config.board_width).astype(int),
+                           (placement.random(num) * self.config.board_height).astype(int),
+                           Creature.eye_rad(placement.random(num)),
+                           Creature.eye_rad(placement.random(num)),
+                           placement.random((num, Genome.genome_size(Creature.genome_sizes))) * 2 - 1)
+
+        # Set last so the initial creatures are not counted as births
+        self.profiler = profiler
+
+    def get_state(self):
+        """
+        Get everything needed to resume the World, apart from its config and events
+
+        Returns:
+            A dictionary with the tick, total_creature_num, and the states of the board, population and random
+            streams. The arrays are views of the World's, so they change as it is stepped
+        """
+        return {"tick": self.tick, "total_creature_num": self.total_creature_num, "board": self.board.get_state(),
+                "population": self.population.get_state(), "random": self.random.get_state()}
+
+    def set_state(self, state):
+        """
+        Replace the tiles and creatures with those of a state from get_state, so the World continues exactly as the
+        World the state was got from would have
+
+        Args:
+            state: A dictionary from get_state of a World with the same settings
+        """
+        self.tick = int(state["tick"])
+        self.total_creature_num = int(state["total_creature_num"])
+        self.board.set_state(state["board"])
+        self.population.set_state(state["population"])
+        self.random.set_state(state["random"])
+        self.grid.remove()
+
+        numbers = self.population.ids.tolist()
+        self.creatures = [Creature.Creature(self, row, number) for row, number in enumerate(numbers)]
+
+    def get_tile(self, x, y):
+        """
+        Get the Tile at a position on the board
+
+        Args:
+            x: A float for the x position
+            y: A float for the y position
+
+        Returns:
+            The Tile containing the position, clamped to the edge of the board
+        """
+        return self.board.get_tile(self.config.get_tile_index(x, y))
+
+    def add_creatures(self, x, y, left_eye_rad, right_eye_rad, genomes, parents=-1):
+        """
+        Add newly born creatures to the World
+
+        Args:
+            x: A sequence of the x positions
+            y: A sequence of the y positions
+            left_eye_rad: A sequence of the left eye radians
+            right_eye_rad: A sequence of the right eye radians
+            genomes: A sequence of the Genome buffers
+            parents: A sequence of the number of each Creature's parent, or -1 for creatures without a parent
+
+        Returns:
+            A list of the new Creatures
+        """
+        num = len(x)
+        numbers = range(self.total_creature_num, self.total_creature_num + num)
+        rows = self.population.add(numbers, x, y, left_eye_rad, right_eye_rad, genomes, self.tick)
+        self.total_creature_num += num
+        self.count("births", num)
+
+        if self.events is not None:
+            self.events.record("birth", self.tick, id=numbers, parent=parents, x=x, y=y)
+
+        born = [Creature.Creature(self, row, number) for row, number in zip(rows, numbers)]
+        self.creatures.extend(born)
+        self.grid.insert(rows)
+
+        return born
+
+    def remove_creature(self, creature):
+        """
+        Remove a dead Creature from the World when the tick ends. It is taken out of the SpatialGrid at once, so no
+        other Creature finds it, but keeps its row until then so the rows of the others do not change mid tick
+
+        Args:
+            creature: The Creature to remove
+        """
+        self.dying.append(creature.slot)
+        self.grid.remove_creature(creature.slot)
+
+    def remove_dying(self):
+        """
+        Remove every Creature that died since the last call at once
+        """
+        if len(self.dying) > 0:
+            alive = np.ones(self.population.size, dtype=bool)
+            alive[self.dying] = False
+            self.dying = []
+
+            self.remove_creatures(alive)
+
+    def remove_creatures(self, alive):
+        """
+        Remove every dead Creature from the World at once
+
+        Args:
+            alive: A boolean array with an element for each Creature that is False if it has died
+        """
+        population = self.population
+        if self.events is not None and self.events.wants("death"):
+            dead = np.flatnonzero(~alive)
+            self.events.record("death", self.tick, id=population.ids[dead], age=self.tick - population.birth_tick[dead],
+                               food=population.food[dead], water=population.water[dead],
+                               cause=Events.get_causes(population.food[dead], population.water[dead]))
+
+        self.count("deaths", int(len(alive) - np.count_nonzero(alive)))
+        population.keep(alive)
+        self.grid.remove(alive)
+
+        dead = [creature for creature, is_alive in zip(self.creatures, alive) if not is_alive]
+        self.creatures = [creature for creature, is_alive in zip(self.creatures, alive) if is_alive]
+
+        for slot, creature in enumerate(self.creatures):
+            creature.slot = slot
+
+        for creature in dead:
+            creature.slot = None
+
+    def step(self, n=1):
+        """
+        Simulate ticks as fast as possible. Creatures born during a tick are first updated on the next tick.
+        When batched or staged, every Creature senses before any Creature acts
+
+        Args:
+            n: An integer count of the ticks to simulate
+        """
+        for i in range(n):
+            size = self.population.size
+            total_creature_num = self.total_creature_num
+
+            if self.profiler is not None:
+                self.profiler.begin()
+
+            if self.batched:
+                self.update_population()
+            elif self.staged:
+                self.update_staged()
+            else:
+                for creature in list(self.creatures):
+                    creature.update()
+
+                self.remove_dying()
+                self.mark("die")
+
+            self.board.advance()
+            self.mark("board")
+
+            if self.events is not None and self.events.wants("tick"):
+                births = self.total_creature_num - total_creature_num
+                population = self.population
+                rows = slice(0, population.size)
+                self.events.record("tick", self.tick, population=population.size, births=births,
+                                   deaths=size + births - population.size,
+                                   mean_food=population.food[rows].mean() if population.size > 0 else 0,
+                                   mean_water=population.water[rows].mean() if population.size > 0 else 0)
+
+            self.tick += 1
+
+            if self.profiler is not None:
+                self.profiler.end(self.tick)
+
+    def mark(self, phase):
+        """
+        End a phase of the tick if the World is profiled
+
+        Args:
+            phase: A string for the name of the phase
+        """
+        if self.profiler is not None:
+            self.profiler.mark(phase)
+
+    def count(self, name, amount=1):
+        """
+        Add to a counter if the World is profiled
+
+        Args:
+            name: A string for the name of the counter
+            amount: A number to add to it
+        """
+        if self.profiler is not None:
+            self.profiler.count(name, amount)
+
+    def update_staged(self):
+        """
+        Update every Creature one at a time, in the same order of steps as update_population: every Creature senses
+        and thinks before any Creature acts, the creatures eating or drinking do so before any fight, the fights
+        happen before any Creature reproduces, and every Creature moves before any dies. Each step goes through the
+        creatures in the order of their rows and does the same arithmetic as update_population, so a staged World is
+        a reference a batched World with the same seed must match exactly
+        """
+        creatures = list(self.creatures)
+
+        inputs = [creature.sense() for creature in creatures]
+        self.mark("sense")
+
+        outputs = [creature.think(creature_inputs) for creature, creature_inputs in zip(creatures, inputs)]
+        self.mark("think")
+
+        for creature, creature_outputs in zip(creatures, outputs):
+            creature.apply_outputs(creature_outputs)
+
+        # 0: Eat, 1: Drink, 2: Reproduce, 3: Fight, 4: Sleep, 5: Nothing
+        for actions in ((0, 1), (3,), (2,)):
+            for creature in creatures:
+                if creature.action in actions:
+                    # Only the tiles eaten or drunk from are synced, the same as update_population
+                    if creature.action in (0, 1):
+                        creature.tile = self.get_tile(creature.x, creature.y)
+
+                    creature.do_action()
+
+        self.mark("act")
+
+        for creature in creatures:
+            creature.move()
+
+        self.mark("move")
+
+        for creature in creatures:
+            creature.die()
+
+        self.remove_dying()
+        self.mark("die")
+
+    def update_population(self):
+        """
+        Update every Creature at once in the same order of steps as Creature.update. When profiled, the tick is split
+        into the phases sense, think, act, move and die, which removes the dead and adds the children born
+        """
+        population = self.population
+        if population.size == 0:
+            return
+
+        inputs = population.sense(self.board, self.config.vision)
+        self.mark("sense")
+
+        outputs = NeuralNetwork.calculate_population(population.sizes, population.genomes[:population.size], inputs,
+                                                     self.config.activation, self.config.output_activation)
+        self.mark("think")
+
+        population.apply_outputs(outputs)
+
+        tiles = self.config.get_tile_indices(population.x[:population.size], population.y[:population.size])
+        action = population.action[:population.size]
+
+        # 0: Eat, 1: Drink, 2: Reproduce, 3: Fight, 4: Sleep, 5: Nothing
+        eating = np.flatnonzero(action == 0)
+        food_eaten = self.board.consume(self.board.food, tiles[eating], 30)
+        population.food[eating] += food_eaten
+
+        drinking = np.flatnonzero(action == 1)
+        water_drunk = self.board.consume(self.board.water, tiles[drinking], 30)
+        population.water[drinking] += water_drunk
+
+        if self.events is not None:
+            self.events.record("eat", self.tick, id=population.ids[eating], amount=food_eaten)
+            self.events.record("drink", self.tick, id=population.ids[drinking], amount=water_drunk)
+
+        fighting = np.flatnonzero(action == 3)
+        if len(fighting) > 0:
+            targets = self.grid.nearest_in_cones(fighting, population.radius[fighting] + self.config.vision,
+                                                 population.direction_facing[fighting], Creature.fight_angle)
+            population.fight(fighting[targets >= 0], targets[targets >= 0])
+
+        children = population.reproduce(self.config.mutation_rate)
+        parents = population.ids[children[5]]
+
+        if self.events is not None:
+            self.events.record("reproduce", self.tick, id=parents, food=population.food[children[5]],
+                               water=population.water[children[5]])
+
+        self.mark("act")
+
+        population.move(Creature.speed_coefficient)
+        self.grid.update()
+        self.mark("move")
+
+        alive = population.alive()
+        if not alive.all():
+            self.remove_creatures(alive)
+
+        if len(parents) > 0:
+            self.add_creatures(*children[:5], parents=parents)
+
+        self.mark("die")
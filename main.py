@@ -1,8 +1,125 @@
-import GUI
+import argparse
+
+import json
+import os
+
+import Activations
+import Checkpoint
+import Config
+import Events
+import Islands
+import Profiler
+import Sweep
+import World
 
 
 def main():
-    GUI.init()
+    parser = argparse.ArgumentParser(description="Evolution Simulator")
+    parser.add_argument("--headless", action="store_true", help="run without a window as fast as possible")
+    parser.add_argument("--ticks", type=int, default=1000, help="amount of ticks to simulate when headless")
+    parser.add_argument("--speed", type=float, default=10,
+                        help="ticks simulated per second in the window, or 0 for as fast as possible")
+    parser.add_argument("--fps", type=float, default=30, help="most frames drawn per second in the window")
+    parser.add_argument("--background", action="store_true",
+                        help="simulate the window's world in another process so drawing never slows it down")
+    parser.add_argument("--events", metavar="DIRECTORY", help="directory to record births, deaths and other events to")
+    parser.add_argument("--event-level", choices=("debug", "info", "summary"), default="info",
+                        help="lowest level of event to record: debug adds eating and drinking, summary only ticks")
+    parser.add_argument("--sample", metavar="EVENT=RATE", nargs="+", default=[],
+                        help="record only this fraction of an event, such as eat=0.01")
+    parser.add_argument("--octaves", type=int, default=1, help="octaves of the noise the terrain is created from")
+    parser.add_argument("--terrain-cache", metavar="DIRECTORY",
+                        help="directory to cache terrain in, so runs with the same terrain skip creating it")
+    parser.add_argument("--activation", choices=sorted(Activations.activations), default="sigmoid",
+                        help="activation of the creatures' hidden neurons")
+    parser.add_argument("--output-activation", choices=Activations.bounded, default="sigmoid",
+                        help="activation of the creatures' output neurons")
+    parser.add_argument("--overlay", action="store_true",
+                        help="show the milliseconds each phase of a tick takes and other counts over the window")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="JSON lines file to append the timings of each phase of a tick to every --metrics-interval"
+                             " ticks")
+    parser.add_argument("--metrics-interval", type=int, default=1000, help="ticks between writes to --metrics")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="file to save the world to every --checkpoint-interval ticks and when it stops")
+    parser.add_argument("--checkpoint-interval", type=int, default=5000, help="ticks between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="continue the world saved in --checkpoint if it exists")
+    parser.add_argument("--islands", type=int, nargs="?", const=os.cpu_count(), default=0,
+                        help="evolve this many headless worlds in parallel processes (default: one per core)")
+    parser.add_argument("--migration-interval", type=int, default=500, help="ticks between island migrations")
+    parser.add_argument("--migrants", type=int, default=5, help="creatures each island sends at every migration")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the world's random numbers, so a run can be repeated exactly")
+    parser.add_argument("--sweep", metavar="GRID", help="JSON file mapping settings to lists of values to run headless")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="seeds to run each sweep configuration with")
+    parser.add_argument("--output", default="sweep_results.jsonl", help="JSON lines file to append sweep results to")
+    args = parser.parse_args()
+
+    events = None
+    if args.events is not None:
+        sample_rates = dict((kind, float(rate)) for kind, rate in (sample.split("=") for sample in args.sample))
+        events = Events.EventLog(args.events, getattr(Events, args.event_level.upper()), sample_rates, seed=args.seed)
+
+    config = Config.WorldConfig(seed=args.seed, terrain_octaves=args.octaves, terrain_cache=args.terrain_cache,
+                                activation=args.activation, output_activation=args.output_activation)
+
+    profiler = None
+    if args.overlay or args.metrics is not None:
+        profiler = Profiler.Profiler(path=args.metrics, interval=args.metrics_interval)
+
+    checkpointer = None
+    if args.checkpoint is not None:
+        checkpointer = Checkpoint.Checkpointer(args.checkpoint, args.checkpoint_interval, args.resume)
+
+    if args.sweep is not None:
+        with open(args.sweep) as grid_file:
+            grid = json.load(grid_file)
+
+        Sweep.run_sweep(grid, args.seeds, args.ticks, args.output, config=config)
+    elif args.islands > 0:
+        Islands.run_islands(args.islands, args.ticks, args.migration_interval, args.migrants, args.seed, config)
+    elif args.headless:
+        run_headless(args.ticks, config, events, checkpointer, profiler)
+    else:
+        # Imported here so running without a window never needs Tk
+        import GUI
+
+        GUI.init(config, ticks_per_second=args.speed if args.speed > 0 else None, fps=args.fps,
+                 background=args.background, events=events, checkpointer=checkpointer, profiler=profiler,
+                 overlay=args.overlay)
+
+
+def run_headless(ticks, config=None, events=None, checkpointer=None, profiler=None):
+    """
+    Simulates a World without a window
+
+    Args:
+        ticks: An integer count of the ticks to simulate
+        config: The WorldConfig of the World, or None for the default settings
+        events: An EventLog to record what happens in the World, or None
+        checkpointer: A Checkpointer to resume the World from and save it with, or None
+        profiler: A Profiler to time the World with, or None
+    """
+    if checkpointer is None:
+        world = World.World(config, events=events, profiler=profiler)
+        world.step(ticks)
+    else:
+        world = checkpointer.create_world(config, events=events)
+        world.profiler = profiler
+
+        for i in range(ticks):
+            world.step()
+            checkpointer.update(world)
+
+        checkpointer.save(world)
+
+    if events is not None:
+        events.close()
+
+    if profiler is not None:
+        profiler.close(world.tick)
+
+    print("%d Creatures alive after %d ticks" % (len(world.creatures), world.tick))
 
 
 if __name__ == "__main__":
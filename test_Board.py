@@ -0,0 +1,69 @@
+import numpy as np
+
+import Board
+import Config
+
+
+def create_board(seed, lazy_regrowth=False, regrowth_rate=1):
+    """
+    Create a small Board with random food and water, some of it nearly used up
+
+    Args:
+        seed: An integer to seed the tiles with
+        lazy_regrowth: A boolean for whether the Board regrows lazily
+        regrowth_rate: An integer amount of food and water each tile regrows per tick
+
+    Returns:
+        A new Board
+    """
+    config = Config.WorldConfig(tiles_per_row=10, lazy_regrowth=lazy_regrowth, regrowth_rate=regrowth_rate)
+    generator = np.random.default_rng(seed)
+    shape = (config.tiles_per_row, config.tiles_per_row)
+
+    return Board.Board(config, generator.integers(0, 256, shape), generator.integers(0, 100, shape),
+                       generator.integers(0, 256, shape))
+
+
+def test_consume():
+    for seed in range(5):
+        board = create_board(seed)
+        generator = np.random.default_rng(seed)
+
+        # Few tiles for many creatures, so most tiles are shared and some run out
+        tiles = generator.integers(0, 12, 60)
+        expected_food = board.food.reshape(-1).copy()
+        expected = []
+        for tile in tiles.tolist():
+            expected.append(min(expected_food[tile], 30))
+            expected_food[tile] -= expected[-1]
+
+        taken = board.consume(board.food, tiles, 30)
+
+        assert taken.tolist() == expected
+        assert np.array_equal(board.food.reshape(-1), expected_food)
+
+
+def test_lazy_regrowth():
+    for regrowth_rate in (1, 3):
+        eager = create_board(0, regrowth_rate=regrowth_rate)
+        lazy = create_board(0, lazy_regrowth=True, regrowth_rate=regrowth_rate)
+        generator = np.random.default_rng(regrowth_rate)
+
+        for tick in range(200):
+            for board in (eager, lazy):
+                board.advance()
+
+            # Eat and drink from some tiles, leaving others untouched for many ticks
+            tiles = generator.integers(0, 30, 10)
+            assert np.array_equal(eager.consume(eager.food, tiles, 30), lazy.consume(lazy.food, tiles, 30))
+            assert np.array_equal(eager.consume(eager.water, tiles, 20), lazy.consume(lazy.water, tiles, 20))
+
+            index = int(generator.integers(0, 100))
+            assert eager.get_tile(index).food == lazy.get_tile(index).food
+
+            if tick % 50 == 0:
+                assert np.array_equal(eager.get_rgb(), lazy.get_rgb())
+
+        lazy.sync()
+        assert np.array_equal(eager.food, lazy.food)
+        assert np.array_equal(eager.water, lazy.water)
@@ -0,0 +1,29 @@
+import Checkpoint
+import Config
+import World
+from test_World import assert_states_equal
+
+
+def test_resume(tmp_path):
+    for batched in (True, False):
+        world = World.World(Config.WorldConfig(seed=4, init_creature_num=150), batched=batched)
+        world.step(50)
+
+        path = str(tmp_path / "world.npz")
+        Checkpoint.save_checkpoint(world, path)
+        resumed = Checkpoint.load_checkpoint(path, batched=batched)
+        assert_states_equal(world.get_state(), resumed.get_state())
+
+        world.step(100)
+        resumed.step(100)
+
+        assert resumed.tick == 150
+        assert_states_equal(world.get_state(), resumed.get_state())
+
+
+def test_read_config(tmp_path):
+    config = Config.WorldConfig(seed=5, init_creature_num=10, tiles_per_row=50, mutation_rate=.2)
+    path = str(tmp_path / "world.npz")
+    Checkpoint.save_checkpoint(World.World(config), path)
+
+    assert Checkpoint.read_config(path).get_settings() == config.get_settings()
@@ -0,0 +1,156 @@
+import math
+
+import numpy as np
+
+import Config
+import World
+
+
+def create_world(tiles_per_row, seed=0):
+    """
+    Create a World whose creatures are spread over the board, with many of them against the right and bottom edges
+    so their centers wrap past them
+
+    Args:
+        tiles_per_row: An integer count of the rows and columns of tiles
+        seed: An integer to seed the World and positions with
+
+    Returns:
+        A World with its SpatialGrid up to date
+    """
+    world = World.World(Config.WorldConfig(seed=seed, init_creature_num=400, tiles_per_row=tiles_per_row))
+    population = world.population
+    rows = slice(0, population.size)
+    width, height = world.config.board_width, world.config.board_height
+
+    generator = np.random.default_rng(seed)
+    population.x[rows] = generator.random(population.size) * width
+    population.y[rows] = generator.random(population.size) * height
+    population.x[:100] = width - generator.random(100) * 10
+    population.y[50:150] = height - generator.random(100) * 10
+    world.grid.update()
+
+    return world
+
+
+def get_distances(world, x, y):
+    """
+    Find the distance from a point to the center of every Creature across the wrapping board by checking them all
+
+    Args:
+        world: The World of the creatures
+        x: A float for the x coordinate of the point
+        y: A float for the y coordinate of the point
+
+    Returns:
+        A tuple of arrays of the x and y distances and the distance to each Creature
+    """
+    population = world.population
+    rows = slice(0, population.size)
+    width, height = world.config.board_width, world.config.board_height
+    dx = (population.x[rows] + population.radius[rows] - x + width / 2) % width - width / 2
+    dy = (population.y[rows] + population.radius[rows] - y + height / 2) % height - height / 2
+
+    return dx, dy, np.hypot(dx, dy)
+
+
+def get_points(world):
+    """
+    Get points to query from, including the centers of creatures wrapped onto the board and the board's corners
+
+    Args:
+        world: The World of the creatures
+
+    Returns:
+        A list of tuples of the x and y coordinates of each point
+    """
+    population = world.population
+    width, height = world.config.board_width, world.config.board_height
+    x = (population.x[:150] + population.radius[:150]) % width
+    y = (population.y[:150] + population.radius[:150]) % height
+
+    return [(0, 0), (width - 1e-9, height - 1e-9)] + list(zip(x.tolist(), y.tolist()))
+
+
+def test_query_radius():
+    for tiles_per_row in (10, 100, 1000):
+        world = create_world(tiles_per_row)
+
+        for x, y in get_points(world):
+            for radius in (1, 15, 60):
+                dx, dy, distance = get_distances(world, x, y)
+
+                expected = set(np.flatnonzero(distance <= radius).tolist())
+                assert set(world.grid.query_radius(x, y, radius).tolist()) == expected
+
+
+def test_query_cone():
+    for tiles_per_row in (10, 100, 1000):
+        world = create_world(tiles_per_row, 1)
+
+        for i, (x, y) in enumerate(get_points(world)):
+            direction = i * .7 % (2 * math.pi)
+            dx, dy, distance = get_distances(world, x, y)
+            angle = np.abs((np.arctan2(dy, dx) - direction + math.pi) % (2 * math.pi) - math.pi)
+
+            expected = set(np.flatnonzero((distance <= 30) & (angle <= math.pi / 4)).tolist())
+            assert set(world.grid.query_cone(x, y, 30, direction, math.pi / 4).tolist()) == expected
+
+
+def test_nearest_in_cones():
+    for tiles_per_row in (10, 100, 1000):
+        world = create_world(tiles_per_row, 2)
+        population = world.population
+        rows = np.arange(population.size)
+        direction = np.arange(population.size) * .7 % (2 * math.pi)
+
+        nearest = world.grid.nearest_in_cones(rows, 30, direction, math.pi / 4)
+        width, height = world.config.board_width, world.config.board_height
+        centers = ((population.x[rows] + population.radius[rows]) % width,
+                   (population.y[rows] + population.radius[rows]) % height)
+
+        for row in rows:
+            dx, dy, distance = get_distances(world, centers[0][row], centers[1][row])
+            angle = np.abs((np.arctan2(dy, dx) - direction[row] + math.pi) % (2 * math.pi) - math.pi)
+            seen = (distance <= 30) & (angle <= math.pi / 4)
+            seen[row] = False
+
+            if seen.any():
+                assert distance[nearest[row]] == distance[seen].min()
+                assert seen[nearest[row]]
+            else:
+                assert nearest[row] == -1
+
+
+def test_update_creature():
+    for tiles_per_row in (10, 100):
+        world = create_world(tiles_per_row, 3)
+        population = world.population
+        generator = np.random.default_rng(3)
+        width, height = world.config.board_width, world.config.board_height
+
+        for i in range(300):
+            # Move a few creatures at a time, some far enough to cross several cells, then query between the moves
+            for row in generator.integers(0, population.size, 5).tolist():
+                distance = generator.choice((1, world.config.tile_width, width / 3))
+                population.x[row] = (population.x[row] + generator.normal() * distance) % width
+                population.y[row] = (population.y[row] + generator.normal() * distance) % height
+                world.grid.update_creature(row)
+
+            x, y = generator.random() * width, generator.random() * height
+            dx, dy, distance = get_distances(world, x, y)
+
+            expected = set(np.flatnonzero(distance <= 40).tolist())
+            assert set(world.grid.query_radius(x, y, 40).tolist()) == expected
+
+        order = np.lexsort((np.arange(population.size), population.cell[:population.size]))
+        assert np.array_equal(world.grid.order, order)
+
+        # Creatures dying and being born keep the rows sorted too
+        world.remove_creatures(generator.random(population.size) < .8)
+        world.add_creatures(generator.random(20) * width, generator.random(20) * height, np.zeros(20), np.zeros(20),
+                            population.genomes[:20].copy())
+
+        order = np.lexsort((np.arange(population.size), population.cell[:population.size]))
+        assert np.array_equal(world.grid.order, order)
+        assert np.array_equal(world.grid.sorted_cells, population.cell[order])
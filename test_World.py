@@ -0,0 +1,40 @@
+import numpy as np
+
+import Config
+import World
+
+
+def assert_states_equal(state, other):
+    """
+    Check two states from World.get_state are exactly the same
+
+    Args:
+        state: A dictionary from World.get_state
+        other: A dictionary from World.get_state
+    """
+    assert state.keys() == other.keys()
+
+    for name, value in state.items():
+        if name in ("board", "population"):
+            assert value.keys() == other[name].keys()
+            for column in value:
+                assert np.array_equal(value[column], other[name][column]), "%s.%s differs" % (name, column)
+        else:
+            assert value == other[name], "%s differs" % name
+
+
+def test_staged_matches_batched():
+    for seed in (0, 1):
+        config = Config.WorldConfig(seed=seed, init_creature_num=200)
+        batched = World.World(config)
+        staged = World.World(config, batched=False, staged=True)
+
+        for i in range(3):
+            batched.step(40)
+            staged.step(40)
+
+            assert_states_equal(batched.get_state(), staged.get_state())
+
+        # The worlds must have been through births, deaths and fights for the test to mean anything
+        assert batched.total_creature_num > 400
+        assert batched.population.size != 200